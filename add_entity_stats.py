@@ -0,0 +1,99 @@
+import sqlite3
+from config import DB_PATH
+
+# Per-brand / per-product counters for the /brands/all and /products/all
+# directories, kept current by triggers, so a directory page is an index
+# range read instead of a GROUP BY over every mention.
+TRIGGERS = [
+    # brands <-> brand_stats rows
+    """CREATE TRIGGER IF NOT EXISTS brands_stats_ai AFTER INSERT ON brands BEGIN
+        INSERT OR IGNORE INTO brand_stats (brand_id) VALUES (new.id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS brands_stats_ad AFTER DELETE ON brands BEGIN
+        DELETE FROM brand_stats WHERE brand_id = old.id;
+    END""",
+    # brand mention counts
+    """CREATE TRIGGER IF NOT EXISTS brand_mentions_stats_ai AFTER INSERT ON brand_mentions BEGIN
+        UPDATE brand_stats SET mention_count = mention_count + 1 WHERE brand_id = new.brand_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS brand_mentions_stats_ad AFTER DELETE ON brand_mentions BEGIN
+        UPDATE brand_stats SET mention_count = mention_count - 1 WHERE brand_id = old.brand_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS brand_mentions_stats_au AFTER UPDATE OF brand_id ON brand_mentions BEGIN
+        UPDATE brand_stats SET mention_count = mention_count - 1 WHERE brand_id = old.brand_id;
+        UPDATE brand_stats SET mention_count = mention_count + 1 WHERE brand_id = new.brand_id;
+    END""",
+    # products <-> product_stats rows, and each brand's product count
+    """CREATE TRIGGER IF NOT EXISTS products_stats_ai AFTER INSERT ON products BEGIN
+        INSERT OR IGNORE INTO product_stats (product_id) VALUES (new.id);
+        UPDATE brand_stats SET product_count = product_count + 1 WHERE brand_id = new.brand_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS products_stats_ad AFTER DELETE ON products BEGIN
+        DELETE FROM product_stats WHERE product_id = old.id;
+        UPDATE brand_stats SET product_count = product_count - 1 WHERE brand_id = old.brand_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS products_stats_au AFTER UPDATE OF brand_id ON products BEGIN
+        UPDATE brand_stats SET product_count = product_count - 1 WHERE brand_id = old.brand_id;
+        UPDATE brand_stats SET product_count = product_count + 1 WHERE brand_id = new.brand_id;
+    END""",
+    # product mention counts
+    """CREATE TRIGGER IF NOT EXISTS product_mentions_stats_ai AFTER INSERT ON product_mentions BEGIN
+        UPDATE product_stats SET mention_count = mention_count + 1 WHERE product_id = new.product_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS product_mentions_stats_ad AFTER DELETE ON product_mentions BEGIN
+        UPDATE product_stats SET mention_count = mention_count - 1 WHERE product_id = old.product_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS product_mentions_stats_au AFTER UPDATE OF product_id ON product_mentions BEGIN
+        UPDATE product_stats SET mention_count = mention_count - 1 WHERE product_id = old.product_id;
+        UPDATE product_stats SET mention_count = mention_count + 1 WHERE product_id = new.product_id;
+    END""",
+]
+
+
+def add_entity_stats():
+    print(f"--- Adding brand_stats / product_stats to {DB_PATH} ---")
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS brand_stats (
+            brand_id INTEGER PRIMARY KEY,
+            mention_count INTEGER NOT NULL DEFAULT 0,
+            product_count INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS product_stats (
+            product_id INTEGER PRIMARY KEY,
+            mention_count INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    # Directory order (mention_count DESC, id DESC) is a backwards scan of these
+    c.execute("CREATE INDEX IF NOT EXISTS idx_brand_stats_rank ON brand_stats(mention_count, brand_id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_product_stats_rank ON product_stats(mention_count, product_id)")
+
+    # Full recount, so re-running this also repairs any drift
+    c.execute("""
+        INSERT OR REPLACE INTO brand_stats (brand_id, mention_count, product_count)
+        SELECT b.id,
+               (SELECT COUNT(*) FROM brand_mentions WHERE brand_id = b.id),
+               (SELECT COUNT(*) FROM products WHERE brand_id = b.id)
+        FROM brands b
+    """)
+    print(f"✅ Backfilled {c.rowcount} brand stats.")
+    c.execute("""
+        INSERT OR REPLACE INTO product_stats (product_id, mention_count)
+        SELECT p.id, (SELECT COUNT(*) FROM product_mentions WHERE product_id = p.id)
+        FROM products p
+    """)
+    print(f"✅ Backfilled {c.rowcount} product stats.")
+
+    for trigger in TRIGGERS:
+        c.execute(trigger)
+
+    conn.commit()
+    conn.close()
+    print("Database schema updated.")
+
+if __name__ == "__main__":
+    add_entity_stats()
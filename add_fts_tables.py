@@ -0,0 +1,65 @@
+import sqlite3
+from config import DB_PATH
+
+# External-content FTS5 tables: the index lives in *_fts, the text stays in
+# the base table, and triggers keep the two in sync. The trigram tokenizer
+# gives substring matching, so MATCH behaves like the old LIKE '%q%' scans.
+FTS_TABLES = [
+    # (fts table, base table, rowid column, indexed columns)
+    ("videos_fts", "videos", "rowid", ["title", "overall_summary"]),
+    ("segments_fts", "video_segments", "id", ["text"]),
+    # name lookups for /search and /autocomplete
+    ("channels_fts", "channels", "rowid", ["title"]),
+    ("brands_fts", "brands", "id", ["name"]),
+    ("products_fts", "products", "id", ["name"]),
+]
+
+
+def add_fts_tables():
+    print(f"--- Adding FTS5 search tables to {DB_PATH} ---")
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+
+    for fts, base, rowid, cols in FTS_TABLES:
+        col_list = ", ".join(cols)
+        new_vals = ", ".join(f"new.{col}" for col in cols)
+        old_vals = ", ".join(f"old.{col}" for col in cols)
+
+        c.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                {col_list}, content='{base}', content_rowid='{rowid}', tokenize='trigram'
+            )
+        """)
+
+        c.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {base} BEGIN
+                INSERT INTO {fts}(rowid, {col_list}) VALUES (new.{rowid}, {new_vals});
+            END
+        """)
+        c.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {base} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.{rowid}, {old_vals});
+            END
+        """)
+        # Only edits to indexed columns touch the index: a stats-only upsert
+        # (view_count, like_count, scores) must not rewrite the row's terms.
+        # Dropped first so databases with the old any-column trigger pick it up.
+        c.execute(f"DROP TRIGGER IF EXISTS {fts}_au")
+        c.execute(f"""
+            CREATE TRIGGER {fts}_au AFTER UPDATE OF {col_list} ON {base} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.{rowid}, {old_vals});
+                INSERT INTO {fts}(rowid, {col_list}) VALUES (new.{rowid}, {new_vals});
+            END
+        """)
+
+        # Index rows that existed before the triggers. Also re-run this
+        # after a VACUUM, which can renumber the implicit rowid on videos.
+        c.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+        print(f"✅ {fts} ready ({base}: {', '.join(cols)}).")
+
+    conn.commit()
+    conn.close()
+    print("Database schema updated.")
+
+if __name__ == "__main__":
+    add_fts_tables()
@@ -0,0 +1,61 @@
+import sqlite3
+from config import DB_PATH
+
+# Indexes for the hot filter + sort paths of the web app.
+INDEXES = [
+    # channel_profile: WHERE channel_id = ? ORDER BY upload_date DESC
+    ("idx_videos_channel_date", "videos(channel_id, upload_date DESC)"),
+    # recent-videos listings / search ordering
+    ("idx_videos_upload", "videos(upload_date DESC)"),
+    # brand_profile / product_profile metrics + timeline: covering, so both
+    # are answered from the index alone, already in date order
+    ("idx_bm_brand_date_sent", "brand_mentions(brand_id, first_seen_date, sentiment_score, channel_id)"),
+    ("idx_pm_product_date_sent", "product_mentions(product_id, first_seen_date, sentiment_score, channel_id)"),
+    # channel_profile stats / clouds and the ?channel= directories: one
+    # channel's mentions as a range, grouped by entity straight off the index
+    ("idx_bm_channel_brand", "brand_mentions(channel_id, brand_id)"),
+    ("idx_pm_channel_product", "product_mentions(channel_id, product_id)"),
+    # product_profile
+    ("idx_product_mentions_product", "product_mentions(product_id, mention_count DESC)"),
+    # brand_profile / product_profile video lists and snippet lookups:
+    # covering, so the mention side of the join never touches the table
+    ("idx_bm_brand_video", "brand_mentions(brand_id, video_id, mention_count, sentiment_score)"),
+    ("idx_pm_product_video", "product_mentions(product_id, video_id, mention_count, sentiment_score)"),
+    # video_profile brand / product chips: one video's mentions, covering
+    ("idx_bm_video_brand", "brand_mentions(video_id, brand_id)"),
+    ("idx_pm_video_product", "product_mentions(video_id, product_id)"),
+    # /brands top channels: ORDER BY subscriber_count DESC LIMIT 10
+    ("idx_channels_subscribers", "channels(subscriber_count DESC)"),
+    # autocomplete prefix fallback (name LIKE 'q%' for 1-2 char terms)
+    ("idx_channels_title_nocase", "channels(title COLLATE NOCASE)"),
+    ("idx_brands_name_nocase", "brands(name COLLATE NOCASE)"),
+    ("idx_products_name_nocase", "products(name COLLATE NOCASE)"),
+    # per-video segment lookups (snippets, video page transcript order)
+    ("idx_video_segments_video", "video_segments(video_id, start_time)"),
+]
+
+# Superseded by a wider index above (a leading-column prefix of it)
+DROPPED = ["idx_brand_mentions_brand_date"]
+
+
+def add_indexes():
+    print(f"--- Adding indexes to {DB_PATH} ---")
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+
+    for name, target in INDEXES:
+        c.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+        print(f"✅ {name} on {target}")
+
+    for name in DROPPED:
+        c.execute(f"DROP INDEX IF EXISTS {name}")
+
+    # Refresh planner statistics so the new indexes actually get picked
+    c.execute("ANALYZE")
+
+    conn.commit()
+    conn.close()
+    print("Database indexes updated.")
+
+if __name__ == "__main__":
+    add_indexes()
@@ -0,0 +1,42 @@
+import sqlite3
+from config import DB_PATH
+
+# Numeric form of videos.overall_sentiment for ad-hoc SQL / reporting.
+# NULL when there is no label. No writer maintains it, so re-run this
+# after labels change; channel_profile derives the same mapping from the
+# label itself and doesn't read the column.
+SCORE_EXPR = """
+    CASE
+        WHEN {col} IS NULL OR {col} = '' THEN NULL
+        WHEN lower({col}) LIKE '%positive%' THEN 100
+        WHEN lower({col}) LIKE '%negative%' THEN 0
+        ELSE 50
+    END
+"""
+
+def add_sentiment_score():
+    print(f"--- Adding overall_sentiment_score to {DB_PATH} ---")
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+
+    try:
+        c.execute("ALTER TABLE videos ADD COLUMN overall_sentiment_score REAL")
+        print("✅ Added 'overall_sentiment_score' column.")
+    except sqlite3.OperationalError:
+        print("ℹ️  'overall_sentiment_score' column already exists.")
+
+    # Backfill existing rows
+    c.execute(f"UPDATE videos SET overall_sentiment_score = {SCORE_EXPR.format(col='overall_sentiment')}")
+    print(f"✅ Backfilled {c.rowcount} videos.")
+
+    # Earlier versions kept it in sync with triggers that UPDATEd the row
+    # being inserted, which corrupted the videos FTS index; drop them.
+    c.execute("DROP TRIGGER IF EXISTS videos_sentiment_score_ai")
+    c.execute("DROP TRIGGER IF EXISTS videos_sentiment_score_au")
+
+    conn.commit()
+    conn.close()
+    print("Database schema updated.")
+
+if __name__ == "__main__":
+    add_sentiment_score()
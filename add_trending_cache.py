@@ -0,0 +1,29 @@
+import sqlite3
+from config import DB_PATH
+
+def add_trending_cache():
+    print(f"--- Adding trending_cache to {DB_PATH} ---")
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+
+    # Materialized /brands rankings, filled by utils/trending.py
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS trending_cache (
+            kind TEXT,          -- 'trending_brands', 'popular_products', ... ('refreshed': last refresh time)
+            slot INTEGER,       -- rank within kind, 0-based
+            id INTEGER,
+            name TEXT,
+            brand_name TEXT,
+            score REAL,
+            cnt INTEGER,
+            refreshed_at REAL,
+            PRIMARY KEY (kind, slot)
+        ) WITHOUT ROWID
+    """)
+
+    conn.commit()
+    conn.close()
+    print("✅ trending_cache ready.")
+
+if __name__ == "__main__":
+    add_trending_cache()
@@ -0,0 +1,45 @@
+import sqlite3
+from config import DB_PATH
+
+# One row per (video, topic), so topic clouds are an indexed GROUP BY
+# instead of splitting the comma-separated videos.topics on every page view.
+# ingest_video.py keeps it current; this creates and backfills it.
+def add_video_topics():
+    print(f"--- Adding video_topics to {DB_PATH} ---")
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS video_topics (
+            video_id TEXT,
+            topic TEXT,
+            PRIMARY KEY (video_id, topic)
+        ) WITHOUT ROWID
+    """)
+
+    c.execute("""
+        INSERT OR IGNORE INTO video_topics (video_id, topic)
+        WITH RECURSIVE split(video_id, rest, topic) AS (
+            SELECT video_id, topics || ',', NULL FROM videos
+            WHERE topics IS NOT NULL AND topics != ''
+            UNION ALL
+            SELECT video_id, substr(rest, instr(rest, ',') + 1), trim(substr(rest, 1, instr(rest, ',') - 1))
+            FROM split WHERE rest != ''
+        )
+        SELECT video_id, topic FROM split WHERE topic IS NOT NULL AND topic != ''
+    """)
+    print(f"✅ Backfilled {c.rowcount} video topics.")
+
+    # Drop a video's topics with it (e.g. utils/reset_channel.py)
+    c.execute("""
+        CREATE TRIGGER IF NOT EXISTS videos_topics_ad AFTER DELETE ON videos BEGIN
+            DELETE FROM video_topics WHERE video_id = old.video_id;
+        END
+    """)
+
+    conn.commit()
+    conn.close()
+    print("Database schema updated.")
+
+if __name__ == "__main__":
+    add_video_topics()
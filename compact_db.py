@@ -0,0 +1,30 @@
+import sqlite3
+from config import DB_PATH
+from utils.db import PAGE_SIZE
+
+
+def compact_db():
+    """
+    Rebuild the database file with PAGE_SIZE pages (VACUUM).
+    Run with the web app and ingest jobs stopped: VACUUM needs exclusive
+    access and temporarily uses about the file's size again on disk.
+    """
+    print(f"--- Compacting {DB_PATH} ---")
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
+
+    current = conn.execute("PRAGMA page_size").fetchone()[0]
+    if current == PAGE_SIZE:
+        print(f"ℹ️ Page size is already {PAGE_SIZE}; vacuuming only.")
+
+    # The page size of a WAL database is fixed, so leave WAL for the rebuild
+    conn.execute("PRAGMA journal_mode=DELETE")
+    conn.execute(f"PRAGMA page_size={PAGE_SIZE}")
+    conn.execute("VACUUM")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA optimize")
+
+    print(f"✅ Page size {current} -> {conn.execute('PRAGMA page_size').fetchone()[0]}.")
+    conn.close()
+
+if __name__ == "__main__":
+    compact_db()
@@ -8,11 +8,16 @@ load_dotenv()
 
 # SQLite DB
 DB_PATH = os.getenv("YOUTUBE_DB", "youtube_insights.db")
+# Dev aid: print the plan of any SELECT that full-scans a table (utils/db.py)
+SQLITE_PLAN_LOG = os.getenv("SQLITE_PLAN_LOG") == "1"
 
 # OpenAI / Gemini
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4.1-mini")
 
+# Max in-flight LLM requests per process (keeps bursts under the RPM limit)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "10"))
+
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
 
@@ -1,11 +1,14 @@
 # db_init.py
 import sqlite3
 from config import DB_PATH
+from utils.db import PAGE_SIZE
 
 def init_db():
     conn = sqlite3.connect(DB_PATH)
     c = conn.cursor()
     c.execute("PRAGMA foreign_keys = ON")
+    # Only takes effect before the first table is created
+    c.execute(f"PRAGMA page_size = {PAGE_SIZE}")
 
     # Channels
     # Added: platform (defaults to YouTube), avatar_url
@@ -33,9 +36,10 @@ def init_db():
             title TEXT,
             channel_name TEXT,
             upload_date TEXT,
-            duration INTEGER,
+            duration INTEGER,       -- seconds, parsed from ISO 8601 at ingest
             overall_summary TEXT,
             overall_sentiment TEXT,
+            overall_sentiment_score REAL,   -- 100 positive / 50 neutral / 0 negative, backfilled by add_sentiment_score.py
             topics TEXT,
             brands TEXT,
             sponsors TEXT,
@@ -63,6 +67,15 @@ def init_db():
         )
     """)
 
+    # Video topics (normalized from videos.topics, see add_video_topics.py)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS video_topics (
+            video_id TEXT,
+            topic TEXT,
+            PRIMARY KEY (video_id, topic)
+        ) WITHOUT ROWID
+    """)
+
     # Brands
     c.execute("""
         CREATE TABLE IF NOT EXISTS brands (
@@ -174,6 +187,36 @@ def init_db():
         )
     """)
 
+    # Directory counters, maintained by triggers (see add_entity_stats.py)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS brand_stats (
+            brand_id INTEGER PRIMARY KEY,
+            mention_count INTEGER NOT NULL DEFAULT 0,
+            product_count INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS product_stats (
+            product_id INTEGER PRIMARY KEY,
+            mention_count INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+
+    # Materialized /brands rankings (utils/trending.py)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS trending_cache (
+            kind TEXT,
+            slot INTEGER,
+            id INTEGER,
+            name TEXT,
+            brand_name TEXT,
+            score REAL,
+            cnt INTEGER,
+            refreshed_at REAL,
+            PRIMARY KEY (kind, slot)
+        ) WITHOUT ROWID
+    """)
+
     # Extraction cache (avoids re-running LLM on same transcript)
     c.execute("""
         CREATE TABLE IF NOT EXISTS video_extraction_cache (
@@ -77,6 +77,12 @@ def ingest_channel(channel_id_or_handle, max_videos=10):
         for i, v in enumerate(videos, 1):
             print(f"[{i}/{total}] Processing {v['title']}...")
             ingest_single_video(v["id"])
+
+        # A batch of new mentions can shift the planner's choices: refresh
+        # sqlite_stat1 for the tables that changed enough to matter
+        conn = sqlite3.connect(DB_PATH)
+        conn.execute("PRAGMA optimize")
+        conn.close()
     else:
         print("Skipping video ingestion (max_videos=0). Channel details updated.")
 
@@ -5,6 +5,7 @@ from ingestion.youtube_client import get_authenticated_service, get_video_metada
 from ingestion.transcript import get_transcript_segments
 from ingestion.extraction import extract_entities_for_video
 from config import DB_PATH
+from utils.db import apply_pragmas
 
 def log_attempt(video_id, channel_id, status, step, error_msg=None):
     """Writes to the ingestion_logs table."""
@@ -61,7 +62,8 @@ def upsert_product(conn, product_name, brand_name=None):
         return row[0] if row else None
 
 def save_video_to_db(video_meta, segments):
-    conn = sqlite3.connect(DB_PATH)
+    # WAL + synchronous=NORMAL: the single commit below doesn't fsync
+    conn = apply_pragmas(sqlite3.connect(DB_PATH))
     c = conn.cursor()
 
     try:
@@ -85,10 +87,11 @@ def save_video_to_db(video_meta, segments):
             INSERT INTO videos (
                 video_id, channel_id, channel_name, title, description, 
                 upload_date, thumbnail_url, view_count, like_count, comment_count, 
-                topics, overall_summary
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                topics, overall_summary, duration
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(video_id) DO UPDATE SET
                 view_count=excluded.view_count,
+                duration=excluded.duration,
                 like_count=excluded.like_count,
                 comment_count=excluded.comment_count,
                 title=excluded.title,
@@ -100,15 +103,25 @@ def save_video_to_db(video_meta, segments):
             video_meta["thumbnail"], video_meta["stats"].get("viewCount", 0),
             video_meta["stats"].get("likeCount", 0), video_meta["stats"].get("commentCount", 0),
             topics_str, 
-            summary
+            summary,
+            video_meta.get("duration_s", 0)
         ))
 
+        # Normalized copy for the topic clouds
+        try:
+            c.execute("DELETE FROM video_topics WHERE video_id = ?", (video_meta["id"],))
+            c.executemany("INSERT OR IGNORE INTO video_topics (video_id, topic) VALUES (?, ?)",
+                          [(video_meta["id"], t.strip()) for t in topics_str.split(",") if t.strip()])
+        except sqlite3.OperationalError:
+            pass  # add_video_topics.py not run yet
+
         try:
             c.execute("UPDATE channels SET video_count = video_count + 1 WHERE channel_id = ?", (video_meta["channel_id"],))
         except: pass
 
         # 3. Save Transcript
         c.execute("DELETE FROM video_segments WHERE video_id = ?", (video_meta["id"],))
+        seg_rows = []
         for seg in segments:
             start = seg.get("start", 0)
             text = seg.get("text", "")
@@ -116,9 +129,9 @@ def save_video_to_db(video_meta, segments):
             if "end" in seg: end = seg["end"]
             elif "duration" in seg: end = start + seg["duration"]
             else: end = start + 5.0
-                
-            c.execute("INSERT INTO video_segments (video_id, start_time, end_time, text) VALUES (?, ?, ?, ?)", 
-                      (video_meta["id"], start, end, text))
+
+            seg_rows.append((video_meta["id"], start, end, text))
+        c.executemany("INSERT INTO video_segments (video_id, start_time, end_time, text) VALUES (?, ?, ?, ?)", seg_rows)
 
         # 4. Link Brands & Products
         for b_name in brands:
@@ -8,10 +8,14 @@ import time
 import random
 from typing import List, Dict, Tuple, Optional
 
-from openai import OpenAI, RateLimitError, APIError
-from config import DB_PATH, OPENAI_API_KEY, OPENAI_MODEL
+from openai import RateLimitError, APIError
+from config import DB_PATH, OPENAI_MODEL, LLM_MAX_CONCURRENCY
+from utils import fastjson
+from utils.llm_client import get_client
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+# Shared across videos so total in-flight LLM calls stay bounded even when
+# several videos are extracted at once
+_llm_pool = concurrent.futures.ThreadPoolExecutor(max_workers=LLM_MAX_CONCURRENCY)
 
 # --- STRICT PROMPT (MERGED: Rules + Summary) ---
 SYSTEM_PROMPT = """
@@ -91,9 +95,9 @@ def get_cached_extraction(conn: sqlite3.Connection, video_id: str, transcript_ha
     row = c.execute("SELECT transcript_hash, brands_json, products_json, sponsors_json, topics_json, summary FROM video_extraction_cache WHERE video_id = ?", (video_id,)).fetchone()
     if not row or row[0] != transcript_hash: return None
     try:
-        topics = json.loads(row[4]) if row[4] else []
+        topics = fastjson.loads(row[4]) if row[4] else []
         summary = row[5] if row[5] else ""
-        return json.loads(row[1]), json.loads(row[2]), json.loads(row[3]), topics, summary
+        return fastjson.loads(row[1]), fastjson.loads(row[2]), fastjson.loads(row[3]), topics, summary
     except: return None
 
 def save_extraction_cache(conn: sqlite3.Connection, video_id: str, transcript_hash: str, brands, products, sponsors, topics, summary):
@@ -108,7 +112,7 @@ def save_extraction_cache(conn: sqlite3.Connection, video_id: str, transcript_ha
             topics_json=excluded.topics_json,
             summary=excluded.summary,
             updated_at=CURRENT_TIMESTAMP
-    """, (video_id, transcript_hash, json.dumps(brands), json.dumps(products), json.dumps(sponsors), json.dumps(topics), summary))
+    """, (video_id, transcript_hash, fastjson.dumps(brands), fastjson.dumps(products), fastjson.dumps(sponsors), fastjson.dumps(topics), summary))
     conn.commit()
 
 def _chunk_text(text: str, max_chars: int = 12000) -> List[str]:
@@ -134,7 +138,7 @@ def _call_llm_for_entities(text: str, max_retries=5) -> Dict:
 
     for attempt in range(max_retries):
         try:
-            resp = client.chat.completions.create(
+            resp = get_client().chat.completions.create(
                 model=OPENAI_MODEL, temperature=0, top_p=1,
                 response_format={"type": "json_object"},
                 messages=[{"role": "system", "content": SYSTEM_PROMPT},
@@ -178,8 +182,7 @@ def extract_entities_for_video(video_id: str, segments: List[Dict]) -> Tuple[Lis
         agg_brands, agg_products, agg_sponsors, agg_topics = [], [], [], []
         first_summary = ""
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-            results = list(executor.map(_call_llm_for_entities, chunks))
+        results = list(_llm_pool.map(_call_llm_for_entities, chunks))
 
         for i, res in enumerate(results):
             agg_brands.extend(res.get("brands", []))
@@ -1,4 +1,5 @@
 import os
+import re
 import googleapiclient.discovery
 from google.oauth2 import service_account
 from dotenv import load_dotenv
@@ -8,6 +9,17 @@ load_dotenv()
 SCOPES = ["https://www.googleapis.com/auth/youtube.force-ssl"]
 SERVICE_ACCOUNT_FILE = os.getenv("YOUTUBE_SERVICE_ACCOUNT_FILE", "account.json")
 
+# YouTube only ever returns this narrow ISO 8601 subset (PT#H#M#S, P#DT... for 24h+)
+_DUR_RE = re.compile(r'P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?')
+
+def parse_duration(duration):
+    """'PT1H2M3S' -> 3723. Returns 0 for missing/unrecognised values."""
+    m = _DUR_RE.fullmatch(duration or "")
+    if not m:
+        return 0
+    d, h, mi, sec = (int(x) for x in m.groups(default="0"))
+    return d * 86400 + h * 3600 + mi * 60 + sec
+
 def get_authenticated_service():
     """Authenticates using the Service Account file defined in .env"""
     if not os.path.exists(SERVICE_ACCOUNT_FILE):
@@ -121,5 +133,6 @@ def get_video_metadata(youtube, video_id):
             "likeCount": int(item["statistics"].get("likeCount", 0)),
             "commentCount": int(item["statistics"].get("commentCount", 0))
         },
-        "duration": item["contentDetails"]["duration"]
+        "duration": item["contentDetails"]["duration"],
+        "duration_s": parse_duration(item["contentDetails"].get("duration"))
     }
@@ -108,7 +108,7 @@ def _call_openai(prompt: str) -> str | None:
             model=OPENAI_MODEL,
             input=prompt,
         )
-        return resp.output[0].content[0].text.strip()
+        return (resp.output_text or "").strip()
     except Exception as e:
         print(f"[LLM_INGEST] OpenAI error: {e}")
         return None
@@ -0,0 +1,125 @@
+import argparse
+import json
+import sqlite3
+import time
+from config import DB_PATH
+from utils import fastjson
+from utils.llm_client import get_client
+from utils.overview import OVERVIEW_MIN_SUMMARIES, build_channel_overview_prompt
+
+# Offline refresh of channel overviews through the OpenAI Batch API
+# (half the price of synchronous calls, results within 24h).
+# The web view still generates on a true cache miss; this keeps the
+# cache fresh so that rarely happens.
+
+OVERVIEW_MODEL = "gpt-4o-mini"
+POLL_SECONDS = 60
+
+# Channels with enough summarized videos and no overview, or an overview
+# older than their newest video (smaller channels get a templated overview
+# in the web view, no LLM call)
+STALE_SQL = f"""
+    SELECT c.channel_id, c.title
+    FROM channels c
+    JOIN (
+        SELECT channel_id, MAX(upload_date) AS last_upload
+        FROM videos
+        WHERE overall_summary IS NOT NULL AND overall_summary != ''
+        GROUP BY channel_id HAVING COUNT(*) >= {OVERVIEW_MIN_SUMMARIES}
+    ) v ON v.channel_id = c.channel_id
+    LEFT JOIN cached_dashboards d ON d.key = 'channel:' || c.channel_id || ':overview'
+    WHERE d.key IS NULL OR datetime(d.updated_at) < datetime(v.last_upload)
+"""
+
+
+def build_batch_lines(conn, channels):
+    lines = []
+    for channel_id, title in channels:
+        summaries = [r[0] for r in conn.execute("""
+            SELECT overall_summary FROM videos
+            WHERE channel_id = ? AND overall_summary IS NOT NULL AND overall_summary != ''
+            ORDER BY upload_date DESC LIMIT 20
+        """, (channel_id,))]
+        lines.append(json.dumps({
+            "custom_id": f"channel:{channel_id}:overview",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": OVERVIEW_MODEL,
+                "messages": [{"role": "user", "content": build_channel_overview_prompt(title, summaries)}],
+                "temperature": 0.3,
+            },
+        }))
+    return lines
+
+
+def submit_batch(lines):
+    batch_file = get_client().files.create(
+        file=("channel_overviews.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch",
+    )
+    batch = get_client().batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    print(f"✅ Submitted batch {batch.id} ({len(lines)} channels).")
+    return batch.id
+
+
+def wait_for_batch(batch_id):
+    while True:
+        batch = get_client().batches.retrieve(batch_id)
+        if batch.status not in ("validating", "in_progress", "finalizing"):
+            return batch
+        print(f"ℹ️  Batch {batch_id} is {batch.status}; checking again in {POLL_SECONDS}s...")
+        time.sleep(POLL_SECONDS)
+
+
+def store_results(conn, batch):
+    if batch.status != "completed" or not batch.output_file_id:
+        print(f"❌ Batch {batch.id} ended with status '{batch.status}'.")
+        return 0
+
+    rows = []
+    for line in get_client().files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        result = json.loads(line)
+        response = result.get("response") or {}
+        if response.get("status_code") != 200:
+            print(f"⚠️  {result.get('custom_id')}: {result.get('error') or response.get('status_code')}")
+            continue
+        overview = response["body"]["choices"][0]["message"]["content"]
+        rows.append((result["custom_id"], fastjson.dumps(overview)))
+
+    conn.executemany("""
+        INSERT INTO cached_dashboards (key, type, payload, updated_at)
+        VALUES (?, 'channel_overview', ?, datetime('now'))
+        ON CONFLICT(key) DO UPDATE SET payload=excluded.payload, updated_at=datetime('now')
+    """, rows)
+    conn.commit()
+    return len(rows)
+
+
+def refresh_overviews(batch_id=None):
+    conn = sqlite3.connect(DB_PATH)
+
+    if batch_id is None:
+        stale = conn.execute(STALE_SQL).fetchall()
+        if not stale:
+            print("ℹ️  All channel overviews are up to date.")
+            conn.close()
+            return
+        batch_id = submit_batch(build_batch_lines(conn, stale))
+
+    batch = wait_for_batch(batch_id)
+    stored = store_results(conn, batch)
+    conn.close()
+    print(f"✅ Stored {stored} channel overviews.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-id", help="Resume waiting on an already submitted batch")
+    args = parser.parse_args()
+    refresh_overviews(args.batch_id)
@@ -1,14 +1,64 @@
-from ingest_video import ingest_single_video
 import sqlite3
 
-# 1. Run Ingestion
-print("Running ingestion for fWfrkV6pu14...")
-ingest_single_video("fWfrkV6pu14")
-
-# 2. Check Result immediately
-conn = sqlite3.connect('youtube_insights.db')
-row = conn.execute("SELECT overall_summary, topics FROM videos WHERE video_id = 'fWfrkV6pu14'").fetchone()
-print("\n--- DATABASE RESULT ---")
-print(f"Summary: {row[0]}")
-print(f"Topics:  {row[1]}")
-conn.close()
+import add_entity_stats
+import add_fts_tables
+import add_indexes
+import add_sentiment_score
+import add_trending_cache
+import add_video_topics
+import db_init
+
+# Schema setup in README Quick Start order
+MIGRATIONS = [
+    (db_init, db_init.init_db),
+    (add_fts_tables, add_fts_tables.add_fts_tables),
+    (add_indexes, add_indexes.add_indexes),
+    (add_sentiment_score, add_sentiment_score.add_sentiment_score),
+    (add_video_topics, add_video_topics.add_video_topics),
+    (add_trending_cache, add_trending_cache.add_trending_cache),
+    (add_entity_stats, add_entity_stats.add_entity_stats),
+]
+
+
+def test_migrations_keep_fts_consistent(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "insights.db")
+    for module, migrate in MIGRATIONS:
+        monkeypatch.setattr(module, "DB_PATH", db_path)
+        migrate()
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        INSERT INTO videos (video_id, channel_id, channel_name, title, overall_summary, overall_sentiment, view_count)
+        VALUES ('v1', 'c1', 'Chan', 'Maybelline Fit Me review', 'Foundation test', 'Positive', 1)
+    """)
+    conn.executemany(
+        "INSERT INTO video_segments (video_id, start_time, end_time, text) VALUES ('v1', ?, ?, ?)",
+        [(0.0, 5.0, "today we test fit me"), (5.0, 9.0, "it oxidizes a bit")],
+    )
+    # What a re-ingest does: stats-only upsert, then a title change
+    conn.execute("UPDATE videos SET view_count = 10, like_count = 2 WHERE video_id = 'v1'")
+    conn.execute("UPDATE videos SET title = 'Fit Me, one week later' WHERE video_id = 'v1'")
+    conn.commit()
+
+    for fts in ("videos_fts", "segments_fts"):
+        conn.execute(f"INSERT INTO {fts}({fts}) VALUES('integrity-check')")
+    assert conn.execute("SELECT count(*) FROM videos_fts WHERE videos_fts MATCH 'week'").fetchone()[0] == 1
+    assert conn.execute("SELECT count(*) FROM videos_fts WHERE videos_fts MATCH 'review'").fetchone()[0] == 0
+    assert conn.execute("SELECT count(*) FROM segments_fts WHERE segments_fts MATCH 'oxidizes'").fetchone()[0] == 1
+    conn.close()
+
+
+if __name__ == "__main__":
+    from ingest_video import ingest_single_video
+
+    # 1. Run Ingestion
+    print("Running ingestion for fWfrkV6pu14...")
+    ingest_single_video("fWfrkV6pu14")
+
+    # 2. Check Result immediately
+    conn = sqlite3.connect('youtube_insights.db')
+    row = conn.execute("SELECT overall_summary, topics FROM videos WHERE video_id = 'fWfrkV6pu14'").fetchone()
+    print("\n--- DATABASE RESULT ---")
+    print(f"Summary: {row[0]}")
+    print(f"Topics:  {row[1]}")
+    conn.close()
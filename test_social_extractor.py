@@ -0,0 +1,32 @@
+import pytest
+
+from utils.social_extractor import extract_socials
+
+# (description text, expected socials); see the ordering notes on _SOCIAL_RE
+CASES = [
+    # An email's domain is not an Instagram handle
+    ("Business: hello@brand.com", {"email": "hello@brand.com"}),
+    ("mail hello@brand.com or dm @jane", {"email": "hello@brand.com", "instagram": "jane"}),
+    # A TikTok "@handle" is not also taken for Instagram
+    ("tiktok.com/@jane.doe", {"tiktok": "@jane.doe"}),
+    ("https://www.tiktok.com/@jane", {"tiktok": "@jane"}),
+    ("Follow me @jane_doe", {"instagram": "jane_doe"}),
+    # Platform links win over the generic website rule
+    ("https://instagram.com/jane", {"instagram": "jane"}),
+    ("https://www.instagram.com/jane.doe/", {"instagram": "jane.doe"}),
+    ("https://x.com/jane", {"twitter": "jane"}),
+    ("https://open.spotify.com/artist/abc123", {"spotify": "abc123"}),
+    ("https://soundcloud.com/jane-doe", {"soundcloud": "jane-doe"}),
+    ("Shop https://janeshop.com", {"website": "https://janeshop.com"}),
+    ("IG https://instagram.com/jane shop https://janeshop.co.uk",
+     {"instagram": "jane", "website": "https://janeshop.co.uk"}),
+    # First match per platform wins
+    ("@first and @second", {"instagram": "first"}),
+    ("", {}),
+    (None, {}),
+]
+
+
+@pytest.mark.parametrize("text,expected", CASES)
+def test_extract_socials(text, expected):
+    assert extract_socials(text) == expected
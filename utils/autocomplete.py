@@ -1,9 +1,47 @@
-import sqlite3
 import json
-from config import DB_PATH
-from openai import OpenAI
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+from utils.db import pooled_conn
+from utils.embeddings import embed
+from utils.llm_client import get_client
+from utils.semantic_cache import SemanticCache
 
-client = OpenAI()
+# Short strings embed close together, so this threshold is stricter than
+# the search answer cache's
+_semantic = SemanticCache(threshold=0.95, max_entries=4096)
+
+# 1-2 chars is too little to predict anything useful
+LLM_MIN_TERM = 3
+
+# Server-side debounce for the LLM fallback: a keystroke burst from one
+# client only pays for the last term typed within the window.
+DEBOUNCE_WINDOW = 0.05
+_pending = {}
+_pending_lock = threading.Lock()
+
+# LLM calls in flight, by normalized term: users typing the same prefix at
+# the same time share one call instead of each missing the cache
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def settle(key) -> bool:
+    """
+    Wait out the debounce window for `key` (the client's per-tab token).
+    Returns False if a newer request from the same key arrived meanwhile,
+    i.e. this one has been superseded and should skip the LLM call.
+    """
+    token = object()
+    with _pending_lock:
+        _pending[key] = token
+    time.sleep(DEBOUNCE_WINDOW)
+    with _pending_lock:
+        if _pending.get(key) is token:
+            del _pending[key]
+            return True
+        return False
 
 def llm_semantic_suggestions(term: str):
     """
@@ -12,6 +50,64 @@ def llm_semantic_suggestions(term: str):
 
     Returns a simple list of suggestion strings.
     """
+    term_norm = term.lower().strip()
+    if len(term_norm) < LLM_MIN_TERM:
+        return []
+    try:
+        return list(_coalesced_llm_semantic(term_norm))
+    except Exception as e:
+        print("[LLM AUTOCOMPLETE ERROR]", e)
+        return []
+
+
+def _coalesced_llm_semantic(term: str) -> tuple[str, ...]:
+    with _inflight_lock:
+        fut = _inflight.get(term)
+        owner = fut is None
+        if owner:
+            fut = _inflight[term] = Future()
+    if not owner:
+        return fut.result()
+
+    try:
+        result = _cached_llm_semantic(term)
+        fut.set_result(result)
+        return result
+    except Exception as e:
+        fut.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[term]
+
+
+@lru_cache(maxsize=4096)
+def _cached_llm_semantic(term: str) -> tuple[str, ...]:
+    """
+    Cached per normalized prefix. API errors propagate (and so are not
+    cached); an empty/unparseable answer is cached so junk input like
+    "xzq" only costs one call.
+    Behind the exact cache, near-identical terms (typos, spacing, plurals)
+    reuse an earlier answer by embedding similarity.
+    """
+    vec = None
+    if _semantic.enabled:
+        try:
+            vec = embed(term)
+            hit = _semantic.get(vec)
+            if hit is not None:
+                return hit
+        except Exception as e:
+            # The embedding is only an optimization; still ask the LLM
+            print("[LLM AUTOCOMPLETE] embedding failed:", e)
+
+    result = _llm_semantic(term)
+    if vec is not None:
+        _semantic.put(vec, result)
+    return result
+
+
+def _llm_semantic(term: str) -> tuple[str, ...]:
     prompt = f"""
 User typed this partial search term: "{term}".
 
@@ -27,76 +123,84 @@ Example output:
 ["maybelline", "maybelline fit me foundation", "sephora haul", "tati westbrook", "rare beauty blush"]
 """
 
+    resp = get_client().chat.completions.create(
+        model="gpt-4.1-mini",
+        temperature=0.2,
+        messages=[{"role": "user", "content": prompt}],
+    )
+    raw = resp.choices[0].message.content.strip()
+    # Try to parse JSON; if it fails, just return empty
     try:
-        resp = client.chat.completions.create(
-            model="gpt-4.1-mini",
-            temperature=0.2,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        raw = resp.choices[0].message.content.strip()
-        # Try to parse JSON; if it fails, just return empty
         suggestions = json.loads(raw)
-        if isinstance(suggestions, list):
-            return [str(s).strip() for s in suggestions if str(s).strip()]
-        return []
-    except Exception as e:
-        print("[LLM AUTOCOMPLETE ERROR]", e)
-        return []
+    except ValueError:
+        return ()
+    if not isinstance(suggestions, list):
+        return ()
+    # Strip once per item and stop at 5 (the prompt asks for 5, but
+    # a chatty model can return more)
+    result = []
+    for s in suggestions:
+        t = str(s).strip()
+        if t:
+            result.append(t)
+            if len(result) >= 5:
+                break
+    return tuple(result)
 
 def db_autocomplete_search(term):
     """
     Pure SQL autocomplete across channels, brands, products, sponsors.
     Returns up to 10 total suggestions.
     """
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-
-    term_like = f"{term.lower()}%"
-
-    results = {
-        "channels": [],
-        "brands": [],
-        "products": [],
-        "sponsors": []
-    }
-
-    # Channels
-    rows = c.execute("""
-        SELECT DISTINCT channel_name
-        FROM videos
-        WHERE LOWER(channel_name) LIKE ?
-        LIMIT 10
-    """, (term_like,)).fetchall()
-    results["channels"] = [r[0] for r in rows]
-
-    # Brands
-    rows = c.execute("""
-        SELECT DISTINCT brand_name
-        FROM brands
-        WHERE LOWER(brand_name) LIKE ?
-        LIMIT 10
-    """, (term_like,)).fetchall()
-    results["brands"] = [r[0] for r in rows]
-
-    # Products
-    rows = c.execute("""
-        SELECT DISTINCT product_name
-        FROM products
-        WHERE LOWER(product_name) LIKE ?
-        LIMIT 10
-    """, (term_like,)).fetchall()
-    results["products"] = [r[0] for r in rows]
-
-    # Sponsors
-    rows = c.execute("""
-        SELECT DISTINCT sponsor_name
-        FROM sponsors
-        WHERE LOWER(sponsor_name) LIKE ?
-        LIMIT 10
-    """, (term_like,)).fetchall()
-    results["sponsors"] = [r[0] for r in rows]
-
-    conn.close()
+    # Same pooled read-only connections as the /autocomplete route
+    with pooled_conn() as conn:
+        c = conn.cursor()
+
+        term_like = f"{term.lower()}%"
+
+        results = {
+            "channels": [],
+            "brands": [],
+            "products": [],
+            "sponsors": []
+        }
+
+        # Channels
+        rows = c.execute("""
+            SELECT DISTINCT channel_name
+            FROM videos
+            WHERE LOWER(channel_name) LIKE ?
+            LIMIT 10
+        """, (term_like,)).fetchall()
+        results["channels"] = [r[0] for r in rows]
+
+        # Brands
+        rows = c.execute("""
+            SELECT DISTINCT brand_name
+            FROM brands
+            WHERE LOWER(brand_name) LIKE ?
+            LIMIT 10
+        """, (term_like,)).fetchall()
+        results["brands"] = [r[0] for r in rows]
+
+        # Products
+        rows = c.execute("""
+            SELECT DISTINCT product_name
+            FROM products
+            WHERE LOWER(product_name) LIKE ?
+            LIMIT 10
+        """, (term_like,)).fetchall()
+        results["products"] = [r[0] for r in rows]
+
+        # Sponsors
+        rows = c.execute("""
+            SELECT DISTINCT sponsor_name
+            FROM sponsors
+            WHERE LOWER(sponsor_name) LIKE ?
+            LIMIT 10
+        """, (term_like,)).fetchall()
+        results["sponsors"] = [r[0] for r in rows]
+        c.close()
     return results
 
 
@@ -104,6 +208,18 @@ def llm_autocomplete_fallback(term):
     """
     LLM predicts intended search terms if DB results are weak.
     """
+    term_norm = term.lower().strip()
+    if len(term_norm) < LLM_MIN_TERM:
+        return []
+    try:
+        return list(_cached_llm_fallback(term_norm))
+    except Exception as e:
+        print("[LLM AUTOCOMPLETE ERROR]", e)
+        return []
+
+
+@lru_cache(maxsize=4096)
+def _cached_llm_fallback(term: str) -> tuple[str, ...]:
     prompt = f"""
 User typed: "{term}"
 
@@ -118,17 +234,19 @@ Return a JSON list of 5 suggestions.
 Example: ["maybelline", "maybelline fit me", "fit me foundation"]
 """
 
+    res = get_client().chat.completions.create(
+        model="gpt-4.1-mini",
+        temperature=0.1,
+        messages=[{"role":"user","content": prompt}]
+    )
+    text = res.choices[0].message.content
     try:
-        res = client.chat.completions.create(
-            model="gpt-4.1-mini",
-            temperature=0.1,
-            messages=[{"role":"user","content": prompt}]
-        )
-        text = res.choices[0].message["content"]
-        return json.loads(text)
-    except Exception as e:
-        return []
-    
+        preds = json.loads(text)
+    except ValueError:
+        return ()
+    # Negative results are cached too, so "xzq" only burns tokens once
+    return tuple(preds) if isinstance(preds, list) else ()
+
 
 def hybrid_autocomplete(term):
     """
@@ -0,0 +1,165 @@
+# utils/db.py
+import atexit
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from config import DB_PATH, SQLITE_PLAN_LOG
+
+# WAL lets the web readers run while an ingest job is writing.
+# synchronous=NORMAL is safe under WAL and skips an fsync per commit.
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=1073741824",  # 1GB; the mapping is the OS page cache, shared by every connection
+    "PRAGMA cache_size=-64000",     # ~64MB page cache, per connection (so per pool slot)
+    "PRAGMA temp_store=MEMORY",     # sorter / GROUP BY temp b-trees stay off disk
+)
+
+# Page size for new / compacted databases (db_init.py, compact_db.py);
+# an existing file keeps its page size until it is VACUUMed
+PAGE_SIZE = 8192
+
+POOL_SIZE = 8          # read-only connections (request handlers)
+WRITE_POOL_SIZE = 2    # read-write; WAL still admits a single writer at a time
+# Per-connection prepared-statement cache (sqlite3 default is 128); the
+# routes' static SQL strings then stay compiled for the connection's life
+CACHED_STATEMENTS = 256
+
+# LIFO so the most recently used (warmest) connection is handed out first.
+# Readers and writers are pooled separately so GET traffic never holds
+# (or waits behind) a connection that is mid-write.
+_pool = queue.LifoQueue(maxsize=POOL_SIZE)
+_rw_pool = queue.LifoQueue(maxsize=WRITE_POOL_SIZE)
+
+
+class PlanLoggingCursor(sqlite3.Cursor):
+    """
+    SQLITE_PLAN_LOG=1 only: the first time each SELECT text runs, its
+    EXPLAIN QUERY PLAN is checked and printed if a table is read with a
+    full SCAN (no index), so a missing index shows up in the dev log.
+    """
+    # Shared by every pooled connection, so across request threads
+    _seen = set()
+    _seen_lock = threading.Lock()
+
+    def execute(self, sql, params=()):
+        with self._seen_lock:
+            first = sql not in self._seen
+            if first:
+                self._seen.add(sql)
+        if first and sql.lstrip()[:6].upper() in ("SELECT", "WITH"):
+            self._log_scans(sql, params)
+        return super().execute(sql, params)
+
+    def _log_scans(self, sql, params):
+        try:
+            plan = [r[3] for r in self.connection.execute("EXPLAIN QUERY PLAN " + sql, params)]
+        except sqlite3.Error:
+            return
+        # CTEs / subqueries are "SCAN <name>" too; skip the ones built here
+        built = {d.split()[1] for d in plan if d.startswith(("MATERIALIZE ", "CO-ROUTINE "))}
+        scans = [d for d in plan if d.startswith("SCAN ") and " USING " not in d
+                 and "VIRTUAL TABLE" not in d and d.split()[1] not in built]
+        if scans:
+            print(f"⚠️ Full scan ({', '.join(scans)}):\n{sql.strip()}\n" + "\n".join(plan))
+
+
+class PlanLoggingConnection(sqlite3.Connection):
+    def cursor(self, factory=PlanLoggingCursor):
+        # Connection.execute() goes through cursor() as well
+        return super().cursor(factory)
+
+
+# Connection class for every connection opened here
+CONNECTION_FACTORY = PlanLoggingConnection if SQLITE_PLAN_LOG else sqlite3.Connection
+
+
+def apply_pragmas(conn: sqlite3.Connection) -> sqlite3.Connection:
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def _new_conn(readonly: bool) -> sqlite3.Connection:
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None,
+                           cached_statements=CACHED_STATEMENTS, factory=CONNECTION_FACTORY)
+    conn.row_factory = sqlite3.Row
+    apply_pragmas(conn)
+    if readonly:
+        conn.execute("PRAGMA query_only=ON")
+    return conn
+
+
+def acquire_conn(readonly: bool = True) -> sqlite3.Connection:
+    """
+    Connection from the process-wide read-only (default) or read-write
+    pool (autocommit, sqlite3.Row rows).
+    Never blocks: if all pooled connections are busy a fresh one is opened,
+    and release_conn() closes the surplus.
+    """
+    try:
+        return (_pool if readonly else _rw_pool).get_nowait()
+    except queue.Empty:
+        return _new_conn(readonly)
+
+
+def release_conn(conn: sqlite3.Connection, readonly: bool = True) -> None:
+    if conn.in_transaction:
+        conn.rollback()
+    try:
+        (_pool if readonly else _rw_pool).put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
+
+@atexit.register
+def close_pool() -> None:
+    for pool in (_pool, _rw_pool):
+        while True:
+            try:
+                conn = pool.get_nowait()
+            except queue.Empty:
+                break
+            # Long-lived connections never hit the usual "optimize before
+            # close" point, so refresh planner stats here (writers only:
+            # query_only connections can't store the ANALYZE results)
+            if pool is _rw_pool:
+                try:
+                    conn.execute("PRAGMA optimize")
+                except sqlite3.Error:
+                    pass
+            conn.close()
+
+
+@contextmanager
+def pooled_conn(readonly: bool = True):
+    conn = acquire_conn(readonly)
+    try:
+        yield conn
+    finally:
+        release_conn(conn, readonly)
+
+
+def fetch_dicts(conn: sqlite3.Connection, sql: str, params=()) -> list[dict]:
+    """
+    Rows as plain dicts, for callers that add keys per row. Skips the
+    sqlite3.Row factory and zips the column names once per result set.
+    """
+    cur = conn.cursor()
+    cur.row_factory = None
+    cur.execute(sql, params)
+    cols = [d[0] for d in cur.description]
+    return [dict(zip(cols, r)) for r in cur]
+
+
+def fts_query(term: str) -> str | None:
+    """
+    Turn free user input into a safe FTS5 MATCH expression (one quoted
+    phrase). Returns None when the term is too short for the trigram
+    tokenizer (< 3 chars); callers fall back to LIKE in that case.
+    """
+    term = (term or "").strip()
+    if len(term) < 3:
+        return None
+    return '"' + term.replace('"', '""') + '"'
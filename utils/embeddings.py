@@ -0,0 +1,39 @@
+# utils/embeddings.py
+import threading
+from collections import OrderedDict
+
+from utils.llm_client import get_client
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Process-wide LRU, so a string embedded once is never sent again while
+# it stays cached
+_CACHE_SIZE = 4096
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def _cache_get(text):
+    with _lock:
+        vec = _cache.get(text)
+        if vec is not None:
+            _cache.move_to_end(text)
+        return vec
+
+
+def _cache_put(text, vec):
+    with _lock:
+        _cache[text] = vec
+        _cache.move_to_end(text)
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def embed(text: str) -> tuple[float, ...]:
+    """Embedding for a single string. Raises on API errors."""
+    vec = _cache_get(text)
+    if vec is None:
+        resp = get_client().embeddings.create(model=EMBEDDING_MODEL, input=text)
+        vec = tuple(resp.data[0].embedding)
+        _cache_put(text, vec)
+    return vec
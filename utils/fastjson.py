@@ -0,0 +1,20 @@
+# utils/fastjson.py
+import json
+
+# orjson is optional: it (de)serializes the cached payloads several times
+# faster than the stdlib; without it we fall back to json, same API
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj) -> bytes:
+    """Compact UTF-8 JSON bytes; SQLite stores them as a BLOB, no re-encoding."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# Both accept str (older TEXT rows) or bytes (BLOB rows)
+loads = orjson.loads if orjson is not None else json.loads
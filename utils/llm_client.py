@@ -0,0 +1,18 @@
+# utils/llm_client.py
+from functools import lru_cache
+from openai import OpenAI, Timeout
+from config import OPENAI_API_KEY
+
+# The SDK waits up to 10 minutes on a stalled read; cap that so a hung call
+# can't hold a worker (or a user) for long, with room left for completions
+# that take tens of seconds to start arriving (extraction)
+TIMEOUT = Timeout(60.0, connect=3.0)
+
+
+@lru_cache(maxsize=1)
+def get_client() -> OpenAI:
+    """
+    Process-wide OpenAI client, built on first use. Every module shares its
+    HTTP connection pool, and importing one doesn't need credentials.
+    """
+    return OpenAI(api_key=OPENAI_API_KEY, timeout=TIMEOUT)
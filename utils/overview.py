@@ -0,0 +1,37 @@
+# utils/overview.py
+from typing import List
+
+from markupsafe import escape
+
+# Channel strategy overview, shared by the web view (web/app.py) and the
+# offline batch refresh (refresh_overviews_batch.py)
+
+# Below this many summarized videos there is nothing for the LLM to analyze;
+# the overview is a short templated note instead (no API call)
+OVERVIEW_MIN_SUMMARIES = 4
+
+
+def build_channel_overview_stub(channel_title: str, summaries: List[str]) -> str:
+    n = len(summaries)
+    latest = summaries[0][:200] if summaries else ""
+    return (
+        f"<p>{escape(channel_title)} has {n} analyzed video{'s' if n != 1 else ''} so far, "
+        f"not enough for a channel strategy overview yet.</p>"
+        f"<p>Most recent: {escape(latest)}</p>"
+    )
+
+
+def build_channel_overview_prompt(channel_title: str, summaries: List[str]) -> str:
+    context_text = "\n- ".join(summaries[:20])
+    return f"""
+    You are a YouTube Strategy Analyst.
+    Analyze these video summaries from the creator "{channel_title}":
+
+    {context_text}
+
+    Write a 2-paragraph "Channel Strategy Overview" describing:
+    1. The main content themes and niches.
+    2. The creator's style (e.g., educational, vlog-style, review-heavy).
+
+    Keep it professional and insightful. HTML format (use <p> tags).
+    """
@@ -9,6 +9,7 @@ from config import DB_PATH
 
 def reset_channel(channel_id):
     conn = sqlite3.connect(DB_PATH)
+    conn.execute("PRAGMA synchronous=NORMAL")
     c = conn.cursor()
 
     print(f"--- Resetting Channel: {channel_id} ---")
@@ -20,6 +21,7 @@ def reset_channel(channel_id):
 
     if not video_ids:
         print("No videos found. Nothing to do.")
+        conn.close()
         return
 
     # 2. Delete Mentions
@@ -28,18 +30,25 @@ def reset_channel(channel_id):
     print("Deleted mentions.")
 
     # 3. Delete AI Cache (CRITICAL: This forces re-extraction of topics)
-    placeholders = ','.join(['?'] * len(video_ids))
-    c.execute(f"DELETE FROM video_extraction_cache WHERE video_id IN ({placeholders})", video_ids)
+    # Static subqueries (no per-size "IN (?,?,...)" text), so this also works
+    # past SQLite's bound-variable limit on very large channels
+    c.execute("""
+        DELETE FROM video_extraction_cache
+        WHERE video_id IN (SELECT video_id FROM videos WHERE channel_id = ?)
+    """, (channel_id,))
     print("Deleted AI extraction cache.")
 
-    # 4. Delete Videos (So ingest_video.py sees them as 'new')
+    # 4. Delete Segments (before the videos they are looked up through)
+    c.execute("""
+        DELETE FROM video_segments
+        WHERE video_id IN (SELECT video_id FROM videos WHERE channel_id = ?)
+    """, (channel_id,))
+    print("Deleted transcript segments.")
+
+    # 5. Delete Videos (So ingest_video.py sees them as 'new')
     c.execute(f"DELETE FROM videos WHERE channel_id = ?", (channel_id,))
     print("Deleted video records.")
 
-    # 5. Delete Segments
-    c.execute(f"DELETE FROM video_segments WHERE video_id IN ({placeholders})", video_ids)
-    print("Deleted transcript segments.")
-
     conn.commit()
     conn.close()
     print("✅ Channel reset complete. Run ingest_channel.py now.")
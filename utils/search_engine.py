@@ -1,56 +1,221 @@
-from openai import OpenAI
 import sqlite3
 import json
 import os
-from config import DB_PATH, OPENAI_API_KEY
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from utils.db import fts_query, pooled_conn
+from utils.embeddings import embed
+from utils.llm_client import get_client
+from utils.semantic_cache import SemanticCache
+
+# One semantic cache per channel scope, so a paraphrase only hits an
+# answer that was built from the same set of channels. Each one holds an
+# embedding matrix, so only the most recently used scopes are kept
+MAX_SEMANTIC_SCOPES = 32
+_semantic_caches = OrderedDict()
+_semantic_lock = threading.Lock()
+
+_executor = ThreadPoolExecutor(max_workers=4)
+
+
+# Static statement text (the channel filter is a bound JSON array, not
+# string-built placeholders) so sqlite3's statement cache can reuse the
+# prepared statements across calls.
+_CHANNEL_FILTER = "(:channels IS NULL OR {col} IN (SELECT value FROM json_each(:channels)))"
+
+_SQL_VIDEOS_FTS = f"""
+    SELECT v.video_id, v.title, v.channel_name, v.overall_summary
+    FROM videos_fts f JOIN videos v ON v.rowid = f.rowid
+    WHERE videos_fts MATCH :q AND {_CHANNEL_FILTER.format(col="v.channel_id")}
+    ORDER BY v.upload_date DESC LIMIT 10
+"""
+
+_SQL_SEGMENTS_FTS = f"""
+    SELECT s.video_id, s.text, s.start_time
+    FROM segments_fts f JOIN video_segments s ON s.id = f.rowid
+    WHERE segments_fts MATCH :q
+      AND (:channels IS NULL OR s.video_id IN (
+          SELECT video_id FROM videos WHERE {_CHANNEL_FILTER.format(col="channel_id")}))
+    LIMIT 10
+"""
+
+_SQL_VIDEOS_LIKE = f"""
+    SELECT v.video_id, v.title, v.channel_name, v.overall_summary
+    FROM videos v
+    WHERE (v.title LIKE :q OR v.overall_summary LIKE :q) AND {_CHANNEL_FILTER.format(col="v.channel_id")}
+    ORDER BY v.upload_date DESC LIMIT 10
+"""
+
+_SQL_SEGMENTS_LIKE = f"""
+    SELECT s.video_id, s.text, s.start_time
+    FROM video_segments s
+    WHERE s.text LIKE :q
+      AND (:channels IS NULL OR s.video_id IN (
+          SELECT video_id FROM videos WHERE {_CHANNEL_FILTER.format(col="channel_id")}))
+    LIMIT 10
+"""
+
+
+def _fetch_matches(c, query, channel_ids=None):
+    """
+    Videos (title/summary) and transcript segments matching `query`.
+    Uses the FTS5 trigram indexes (see add_fts_tables.py); falls back to
+    LIKE scans for very short terms or when the FTS tables are missing.
+    """
+    channels = json.dumps(list(channel_ids)) if channel_ids else None
+    match = fts_query(query)
+    if match:
+        try:
+            params = {"q": match, "channels": channels}
+            return (c.execute(_SQL_VIDEOS_FTS, params).fetchall(),
+                    c.execute(_SQL_SEGMENTS_FTS, params).fetchall())
+        except sqlite3.OperationalError:
+            pass  # FTS tables not created yet
+
+    params = {"q": f"%{query}%", "channels": channels}
+    return (c.execute(_SQL_VIDEOS_LIKE, params).fetchall(),
+            c.execute(_SQL_SEGMENTS_LIKE, params).fetchall())
+
+
+# Exact-match layer in front of the semantic caches:
+# (normalized query, channel set) -> answer.
+# Only real answers are stored; a query with no matches yet may match after
+# the next ingest, and LLM failures should be retried
+EXACT_CACHE_SIZE = 1024
+_answers = OrderedDict()
+_answers_lock = threading.Lock()
+
+
+def _answer_key(query: str, channel_ids):
+    return query.strip().lower(), tuple(sorted(channel_ids)) if channel_ids else None
+
+
+def _exact_get(key):
+    with _answers_lock:
+        answer = _answers.get(key)
+        if answer is not None:
+            _answers.move_to_end(key)
+        return answer
+
+
+def _exact_put(key, answer) -> None:
+    with _answers_lock:
+        _answers[key] = answer
+        _answers.move_to_end(key)
+        if len(_answers) > EXACT_CACHE_SIZE:
+            _answers.popitem(last=False)
 
-client = OpenAI(api_key=OPENAI_API_KEY)
 
 def answer_user_query(query: str, channel_ids=None):
     """
-    LLM-powered semantic search over transcripts + metadata.
+    LLM-powered semantic search over transcripts + metadata: the whole
+    answer from answer_user_query_stream, or None (no matches / error).
     """
     if not query or len(query.strip()) == 0:
         return "Please enter a search query."
+    return "".join(answer_user_query_stream(query, channel_ids)).strip() or None
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
 
-    # 1. Search Videos
-    sql_videos = """
-        SELECT video_id, title, channel_name, overall_summary
-        FROM videos
-        WHERE title LIKE ? OR overall_summary LIKE ?
-        ORDER BY upload_date DESC LIMIT 10
+def answer_user_query_stream(query: str, channel_ids=None, conn=None):
     """
-    q_like = f"%{query}%"
-    videos = c.execute(sql_videos, (q_like, q_like)).fetchall()
-
-    # 2. Search Transcript Segments
-    sql_segments = """
-        SELECT video_id, text, start_time
-        FROM video_segments
-        WHERE text LIKE ?
-        LIMIT 10
+    Answer to `query`, yielded in chunks as the LLM produces them.
+    Answers are cached per (normalized query, channel set), then by
+    embedding similarity for paraphrases. A cached answer (exact or semantic)
+    is yielded whole. Yields nothing when there are no matches or on error.
+    Pass `conn` to run the lookups on the caller's connection.
     """
-    segments = c.execute(sql_segments, (q_like,)).fetchall()
+    if not query or not query.strip():
+        return
 
-    conn.close()
+    key = _answer_key(query, channel_ids)
+    hit = _exact_get(key)
+    if hit is not None:
+        yield hit
+        return
 
-    if not videos and not segments:
-        return None
+    try:
+        cache, vec, hit, videos, segments = _lookup(*key, conn)
+        if hit is not None:
+            _exact_put(key, hit)
+            yield hit
+            return
+        if not videos and not segments:
+            return
 
-    # 3. Context Builder
-    context_str = "VIDEOS FOUND:\n"
-    for v in videos[:5]:
-        context_str += f"- {v['title']} (Channel: {v['channel_name']}): {v['overall_summary']}\n"
+        response = get_client().chat.completions.create(
+            model="gpt-4o-mini",
+            messages=_build_messages(key[0], videos, segments),
+            temperature=0.3,
+            stream=True,
+        )
+        parts = []
+        for chunk in response:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                yield delta
+
+        answer = "".join(parts).strip()
+        if answer:
+            _exact_put(key, answer)
+            if vec is not None:
+                cache.put(vec, answer)
+    except Exception as e:
+        print(f"LLM Error: {e}")
+
+
+def _lookup(query: str, channel_ids, conn=None):
+    """
+    DB matches plus a semantic-cache probe for `query`.
+    Returns (cache, query embedding or None, cached answer or None, videos, segments).
+    """
+    cache = _semantic_cache(channel_ids)
+
+    # Overlap the embedding round-trip with the DB lookups; on a semantic
+    # hit the matches are simply discarded
+    vec_future = _executor.submit(embed, query) if cache.enabled else None
+    videos, segments = _load_matches(query, channel_ids, conn)
+
+    vec, hit = None, None
+    if vec_future is not None:
+        try:
+            vec = vec_future.result()
+        except Exception as e:
+            print(f"Embedding Error: {e}")
+        else:
+            hit = cache.get(vec)
+    return cache, vec, hit, videos, segments
+
+
+def _semantic_cache(channel_ids) -> SemanticCache:
+    with _semantic_lock:
+        cache = _semantic_caches.get(channel_ids)
+        if cache is None:
+            cache = _semantic_caches[channel_ids] = SemanticCache()
+            if len(_semantic_caches) > MAX_SEMANTIC_SCOPES:
+                _semantic_caches.popitem(last=False)
+        else:
+            _semantic_caches.move_to_end(channel_ids)
+        return cache
 
-    context_str += "\nTRANSCRIPT MATCHES:\n"
-    for s in segments[:5]:
-        context_str += f"- ...{s['text']}...\n"
 
-    # 4. LLM Call
+def _load_matches(query: str, channel_ids, conn=None):
+    if conn is not None:
+        return _fetch_matches(conn.cursor(), query, channel_ids)
+    with pooled_conn() as conn:
+        return _fetch_matches(conn.cursor(), query, channel_ids)
+
+
+def _build_messages(query: str, videos, segments):
+    # 3. Context Builder (one join instead of repeated +=)
+    context_str = "".join([
+        "VIDEOS FOUND:\n",
+        *(f"- {v['title']} (Channel: {v['channel_name']}): {v['overall_summary']}\n" for v in videos[:5]),
+        "\nTRANSCRIPT MATCHES:\n",
+        *(f"- ...{s['text']}...\n" for s in segments[:5]),
+    ])
+
     prompt = f"""
     User Query: "{query}"
 
@@ -60,17 +225,5 @@ def answer_user_query(query: str, channel_ids=None):
     Context:
     {context_str}
     """
-
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "system", "content": "You are a helpful search assistant."},
-                      {"role": "user", "content": prompt}],
-            temperature=0.3,
-        )
-        # FIX: Use dot notation instead of brackets
-        return response.choices[0].message.content.strip()
-
-    except Exception as e:
-        print(f"LLM Error: {e}")
-        return None
+    return [{"role": "system", "content": "You are a helpful search assistant."},
+            {"role": "user", "content": prompt}]
@@ -0,0 +1,91 @@
+# utils/semantic_cache.py
+import threading
+
+# numpy is optional: without it the semantic layer is simply disabled
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class SemanticCache:
+    """
+    Answers keyed by query embedding: a lookup hits when the cosine
+    similarity to a cached query is >= threshold, so paraphrases of a
+    question already answered don't go back to the LLM.
+    Linear scan over normalized embeddings stored as int8 with a per-row
+    scale (4x smaller than float32; recall loss is negligible for cosine
+    on unit vectors). Oldest entries are evicted first.
+    Rows live in a preallocated matrix that doubles as it fills (up to
+    max_entries, then used as a ring), so a put never copies every row.
+    """
+
+    def __init__(self, threshold: float = 0.92, max_entries: int = 10_000):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._matrix = None     # int8, one quantized row per cached query
+        self._scales = None     # float32, dequantization scale per row
+        self._values = []       # the first len(_values) rows are live
+        self._oldest = 0        # slot the next put overwrites once full
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return np is not None
+
+    def __len__(self):
+        return len(self._values)
+
+    @staticmethod
+    def _quantize(vec):
+        v = np.asarray(vec, dtype=np.float32)
+        norm = np.linalg.norm(v)
+        if norm:
+            v = v / norm
+        peak = float(np.max(np.abs(v))) if v.size else 0.0
+        if not peak:
+            return np.zeros(v.shape, dtype=np.int8), np.float32(0)
+        q = np.round(v / peak * 127).astype(np.int8)
+        return q, np.float32(peak / 127)
+
+    def get(self, vec):
+        if not self.enabled:
+            return None
+        q, q_scale = self._quantize(vec)
+        with self._lock:
+            n = len(self._values)
+            if not n:
+                return None
+            # int8 * int8 products overflow int8, so accumulate in int32
+            dots = self._matrix[:n].astype(np.int32) @ q.astype(np.int32)
+            sims = dots * self._scales[:n] * q_scale
+            best = int(sims.argmax())
+            if sims[best] >= self.threshold:
+                return self._values[best]
+        return None
+
+    def put(self, vec, value) -> None:
+        if not self.enabled:
+            return
+        q, scale = self._quantize(vec)
+        with self._lock:
+            n = len(self._values)
+            if n < self.max_entries:
+                if self._matrix is None or n == len(self._matrix):
+                    self._grow(min(max(2 * n, 64), self.max_entries), q.size)
+                slot = n
+                self._values.append(value)
+            else:
+                slot = self._oldest
+                self._oldest = (slot + 1) % self.max_entries
+                self._values[slot] = value
+            self._matrix[slot] = q
+            self._scales[slot] = scale
+
+    def _grow(self, rows: int, dim: int) -> None:
+        matrix = np.empty((rows, dim), dtype=np.int8)
+        scales = np.empty(rows, dtype=np.float32)
+        n = len(self._values)
+        if n:
+            matrix[:n], scales[:n] = self._matrix[:n], self._scales[:n]
+        self._matrix, self._scales = matrix, scales
@@ -0,0 +1,104 @@
+# utils/trending.py
+import heapq
+import sqlite3
+import threading
+import time
+from operator import itemgetter
+from utils.db import pooled_conn
+
+# Rankings shown on the /brands landing page. They move slowly, so they are
+# materialized into trending_cache (see add_trending_cache.py) and recomputed
+# at most every TRENDING_TTL seconds instead of on every page view.
+TRENDING_TTL = 300
+
+TRENDING_KINDS = ("trending_brands", "trending_products", "popular_brands", "popular_products")
+TRENDING_LIMIT = 5
+
+# Sentinel trending_cache row holding the last refresh time, written even
+# when the rankings come out empty (no mentions yet) so the TTL still holds
+REFRESHED_KIND = "refreshed"
+_refresh_lock = threading.Lock()
+
+# One aggregate per entity type; "trending" (most mentions) and "popular"
+# (best average sentiment, 2+ mentions) are both picked from its rows.
+# Mentions are grouped before the name join, off the covering
+# (entity_id, first_seen_date, sentiment_score, ...) indexes.
+TRENDING_SQL = {
+    "brands": """
+        SELECT b.id, b.name, NULL as brand_name, s.score, s.cnt
+        FROM (SELECT brand_id, AVG(sentiment_score) as score, COUNT(*) as cnt
+              FROM brand_mentions GROUP BY brand_id) s
+        JOIN brands b ON b.id = s.brand_id
+    """,
+    "products": """
+        SELECT p.id, p.name, b.name as brand_name, s.score, s.cnt
+        FROM (SELECT product_id, AVG(sentiment_score) as score, COUNT(*) as cnt
+              FROM product_mentions GROUP BY product_id) s
+        JOIN products p ON p.id = s.product_id
+        LEFT JOIN brands b ON p.brand_id = b.id
+    """,
+}
+
+
+def refresh_trending(conn) -> None:
+    """Recompute every ranking and replace trending_cache in one transaction."""
+    now = time.time()
+    rows = []
+    for entity, sql in TRENDING_SQL.items():
+        stats = conn.execute(sql).fetchall()
+        ranked = (
+            (f"trending_{entity}", heapq.nlargest(TRENDING_LIMIT, stats, key=itemgetter(4)), False),
+            (f"popular_{entity}", heapq.nlargest(
+                TRENDING_LIMIT, (r for r in stats if r[4] > 1 and r[3] is not None), key=itemgetter(3)), True),
+        )
+        for kind, top, with_score in ranked:
+            for slot, r in enumerate(top):
+                rows.append((kind, slot, r[0], r[1], r[2], r[3] if with_score else None, r[4], now))
+    rows.append((REFRESHED_KIND, 0, None, None, None, None, None, now))
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM trending_cache")
+        conn.executemany("""
+            INSERT INTO trending_cache (kind, slot, id, name, brand_name, score, cnt, refreshed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _is_stale(conn) -> bool:
+    row = conn.execute("SELECT refreshed_at FROM trending_cache WHERE kind = ? AND slot = 0",
+                       (REFRESHED_KIND,)).fetchone()
+    return row is None or time.time() - row[0] > TRENDING_TTL
+
+
+def get_trending(conn) -> dict:
+    """
+    {kind: [rows]} from trending_cache, refreshed first if older than
+    TRENDING_TTL. `conn` may be read-only; the refresh takes a writer.
+    One request refreshes at a time; the others serve the stale rows.
+    """
+    result = {kind: [] for kind in TRENDING_KINDS}
+    try:
+        if _is_stale(conn) and _refresh_lock.acquire(blocking=False):
+            try:
+                with pooled_conn(readonly=False) as wconn:
+                    # Another request may have refreshed just before the lock
+                    if _is_stale(wconn):
+                        refresh_trending(wconn)
+            except sqlite3.OperationalError as e:
+                print(f"[TRENDING] refresh failed: {e}")
+            finally:
+                _refresh_lock.release()
+
+        rows = conn.execute("SELECT kind, id, name, brand_name, score, cnt FROM trending_cache ORDER BY kind, slot").fetchall()
+    except sqlite3.OperationalError:
+        return result  # add_trending_cache.py not run yet
+
+    for row in rows:
+        if row["kind"] != REFRESHED_KIND:
+            result[row["kind"]].append(row)
+    return result
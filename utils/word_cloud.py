@@ -0,0 +1,49 @@
+# utils/word_cloud.py
+import re
+from collections import Counter
+
+# vaderSentiment is optional: without it every word is tagged neutral
+try:
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    _vader = SentimentIntensityAnalyzer()
+except ImportError:
+    _vader = None
+
+# "Common Associations" cloud built locally from the mention snippets:
+# plain frequency counting, no LLM round-trip.
+WORD_RE = re.compile(r"[a-z][a-z'-]{2,}")
+
+STOPWORDS = frozenset("""
+    the and for that this with you your are was were have has had not but
+    its it's they them their there then than what when where which who will
+    would could should about just like really very much more most some also
+    from into onto over only because been being can can't don't didn't i'm
+    i've you're we're that's all any out two get got going gonna
+    know think one one's here now too yeah okay well so kind sort thing things
+    lot little bit use used using make made video videos today guys
+""".split())
+
+
+def build_word_cloud(texts, exclude: str = "", limit: int = 20) -> list[dict]:
+    """
+    [{text, weight (1-5), sentiment}] for the most frequent words in
+    `texts`, skipping stopwords and the words of `exclude` (the entity name).
+    """
+    skip = STOPWORDS | set(WORD_RE.findall(exclude.lower()))
+    counts = Counter(w for t in texts for w in WORD_RE.findall(t.lower()) if w not in skip)
+    top = counts.most_common(limit)
+    if not top:
+        return []
+
+    peak = top[0][1]
+    cloud = []
+    for word, n in top:
+        sentiment = "neutral"
+        if _vader is not None:
+            score = _vader.polarity_scores(word)["compound"]
+            if score >= 0.05:
+                sentiment = "positive"
+            elif score <= -0.05:
+                sentiment = "negative"
+        cloud.append({"text": word, "weight": 1 + round(4 * n / peak), "sentiment": sentiment})
+    return cloud
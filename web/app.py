@@ -1,99 +1,153 @@
 import os
 import sys
-import json
 import sqlite3
-from collections import Counter
 from datetime import datetime
-from flask import Flask, render_template, request, g, jsonify, url_for, redirect
+from flask import Flask, Response, render_template, request, g, jsonify, url_for, redirect, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from dotenv import load_dotenv
-from openai import OpenAI
+from jinja2 import FileSystemBytecodeCache
 import time
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 # Add parent directory to path to import config
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.append(BASE_DIR)
 
-from utils.search_engine import answer_user_query
-from utils.autocomplete import hybrid_autocomplete, llm_semantic_suggestions
+from utils import fastjson
+from utils.llm_client import get_client
+from utils.db import acquire_conn, fetch_dicts, fts_query, pooled_conn, release_conn
+from utils.search_engine import answer_user_query_stream
+from utils.trending import get_trending
+from utils.word_cloud import build_word_cloud
+from utils.autocomplete import LLM_MIN_TERM, llm_semantic_suggestions, settle
+from utils.overview import OVERVIEW_MIN_SUMMARIES, build_channel_overview_prompt, build_channel_overview_stub
 from web.qa import ask_insights_llm
 
 load_dotenv()
 
 app = Flask(__name__, static_folder="static", template_folder="templates")
-DB_PATH = os.getenv("YOUTUBE_DB", "youtube_insights.db")
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=OPENAI_API_KEY)
-
-def get_db():
-    db = getattr(g, "_database", None)
+# Outside development: never stat templates for changes, and keep compiled
+# template bytecode on disk so it survives restarts
+if os.getenv("FLASK_ENV") != "development":
+    app.config["TEMPLATES_AUTO_RELOAD"] = False
+    app.jinja_env.auto_reload = False
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """jsonify() / request.json through orjson (see utils/fastjson)."""
+    def dumps(self, obj, **kwargs):
+        return fastjson.dumps(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return fastjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # orjson's bytes go straight into the body, no str round-trip
+        return self._app.response_class(fastjson.dumps(self._prepare_response_obj(args, kwargs)),
+                                        mimetype=self.mimetype)
+
+if fastjson.orjson is not None:
+    app.json = FastJSONProvider(app)
+VIDEOS_PER_PAGE = 50
+
+# Flask-Caching is optional: with it, the rendered HTML of the read-only
+# profile / directory pages is reused for PAGE_CACHE_TTL seconds per URL
+# (query string included). Ingestion runs in another process, so expiry
+# is the only invalidation; new videos show up within the TTL.
+PAGE_CACHE_TTL = 120
+try:
+    from flask_caching import Cache
+    _page_cache = Cache(app, config={"CACHE_TYPE": "SimpleCache", "CACHE_DEFAULT_TIMEOUT": PAGE_CACHE_TTL})
+    cached_page = _page_cache.cached(timeout=PAGE_CACHE_TTL, query_string=True)
+except ImportError:
+    def cached_page(view):
+        return view
+
+# Channel overviews are generated off the request thread; the page polls
+# /channel/<id>/overview until the cached result shows up
+_overview_executor = ThreadPoolExecutor(max_workers=8)
+_overview_in_flight = set()
+_overview_lock = threading.Lock()
+
+def get_db(readonly=True):
+    """Request-scoped connection; read-only unless the handler asks to write."""
+    attr = "_database" if readonly else "_database_rw"
+    db = getattr(g, attr, None)
     if db is None:
-        db = g._database = sqlite3.connect(DB_PATH)
-        db.row_factory = sqlite3.Row
+        db = acquire_conn(readonly)
+        setattr(g, attr, db)
     return db
 
 @app.teardown_appcontext
 def close_connection(exception):
-    db = getattr(g, "_database", None)
-    if db is not None:
-        db.close()
+    for attr, readonly in (("_database", True), ("_database_rw", False)):
+        db = getattr(g, attr, None)
+        if db is not None:
+            release_conn(db, readonly)
 
 # --- INTELLIGENCE HELPERS ---
 
-def get_channel_overview(conn, channel_id, channel_title, videos):
-    """Generates a text summary of the channel based on video summaries."""
-    cache_key = f"channel:{channel_id}:overview"
-
-    # 1. Check Cache
-    cached = conn.execute("SELECT payload FROM cached_dashboards WHERE key = ?", (cache_key,)).fetchone()
-    if cached:
-        return json.loads(cached['payload'])
-
-    # 2. Prepare Data
-    summaries = [v['overall_summary'] for v in videos if v['overall_summary']]
-    if not summaries:
-        return "No video data available to generate a summary."
-
-    context_text = "\n- ".join(summaries[:20])
-
-    prompt = f"""
-    You are a YouTube Strategy Analyst.
-    Analyze these video summaries from the creator "{channel_title}":
-
-    {context_text}
-
-    Write a 2-paragraph "Channel Strategy Overview" describing:
-    1. The main content themes and niches.
-    2. The creator's style (e.g., educational, vlog-style, review-heavy).
-
-    Keep it professional and insightful. HTML format (use <p> tags).
-    """
-
-    try:
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3
-        )
-        overview = resp.choices[0].message.content
-
-        conn.execute("""
-            INSERT INTO cached_dashboards (key, type, payload, updated_at)
-            VALUES (?, 'channel_overview', ?, datetime('now'))
-            ON CONFLICT(key) DO UPDATE SET payload=excluded.payload, updated_at=datetime('now')
-        """, (cache_key, json.dumps(overview)))
-        conn.commit()
-
-        return overview
-    except Exception as e:
-        print(f"Error generating channel overview: {e}")
-        return "<p>Unable to generate analysis at this time.</p>"
+def get_cached_channel_overview(conn, channel_id):
+    """The cached channel overview HTML, or None if it hasn't been generated yet."""
+    cached = conn.execute("SELECT payload FROM cached_dashboards WHERE key = ?", (f"channel:{channel_id}:overview",)).fetchone()
+    return fastjson.loads(cached['payload']) if cached else None
+
+def generate_channel_overview(channel_id, channel_title):
+    """Generates the channel overview from recent video summaries and caches it (background job)."""
+    with pooled_conn(readonly=False) as conn:
+        summaries = [r['overall_summary'] for r in conn.execute("""
+            SELECT overall_summary FROM videos
+            WHERE channel_id = ? AND overall_summary IS NOT NULL AND overall_summary != ''
+            ORDER BY upload_date DESC LIMIT 20
+        """, (channel_id,))]
+        if not summaries:
+            return
+
+        prompt = build_channel_overview_prompt(channel_title, summaries)
+
+        try:
+            resp = get_client().chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.3
+            )
+            overview = resp.choices[0].message.content
+
+            conn.execute("""
+                INSERT INTO cached_dashboards (key, type, payload, updated_at)
+                VALUES (?, 'channel_overview', ?, datetime('now'))
+                ON CONFLICT(key) DO UPDATE SET payload=excluded.payload, updated_at=datetime('now')
+            """, (f"channel:{channel_id}:overview", fastjson.dumps(overview)))
+        except Exception as e:
+            print(f"Error generating channel overview: {e}")
+
+def request_channel_overview(channel_id, channel_title):
+    """Queue overview generation unless it is already running for this channel."""
+    with _overview_lock:
+        if channel_id in _overview_in_flight:
+            return
+        _overview_in_flight.add(channel_id)
+
+    def job():
+        try:
+            generate_channel_overview(channel_id, channel_title)
+        finally:
+            with _overview_lock:
+                _overview_in_flight.discard(channel_id)
+
+    _overview_executor.submit(job)
 
 def get_brand_intelligence(conn, brand_id, brand_name, context_data, last_mention):
-    return {"brief": f"<p>Analysis for {brand_name}...</p>", "video_summaries": {}, "word_cloud": []}
+    word_cloud = build_word_cloud((i['text'] for i in context_data), exclude=brand_name)
+    return {"brief": f"<p>Analysis for {brand_name}...</p>", "video_summaries": {}, "word_cloud": word_cloud}
 
 def get_product_intelligence(conn, product_id, product_name, context_data, last_mention):
-    return {"brief": f"<p>Analysis for {product_name}...</p>", "video_summaries": {}, "word_cloud": []}
+    word_cloud = build_word_cloud((i['text'] for i in context_data), exclude=product_name)
+    return {"brief": f"<p>Analysis for {product_name}...</p>", "video_summaries": {}, "word_cloud": word_cloud}
 
 # --- ROUTES ---
 
@@ -105,242 +159,412 @@ def brands_hub():
     """Brands Landing Page (The missing route!)"""
     conn = get_db()
 
-    # 1. Trending Brands
-    trending_brands = conn.execute("""
-        SELECT b.name, b.id, count(bm.id) as cnt
-        FROM brands b JOIN brand_mentions bm ON b.id = bm.brand_id
-        GROUP BY b.id ORDER BY cnt DESC LIMIT 5
-    """).fetchall()
-
-    # 2. Trending Products
-    trending_products = conn.execute("""
-        SELECT p.name, p.id, b.name as brand_name, count(pm.id) as cnt
-        FROM products p
-        JOIN product_mentions pm ON p.id = pm.product_id
-        LEFT JOIN brands b ON p.brand_id = b.id
-        GROUP BY p.id ORDER BY cnt DESC LIMIT 5
-    """).fetchall()
-
-    # 3. Popular Brands
-    popular_brands = conn.execute("""
-        SELECT b.name, b.id, AVG(bm.sentiment_score) as score, count(bm.id) as c
-        FROM brands b JOIN brand_mentions bm ON b.id = bm.brand_id
-        GROUP BY b.id HAVING c > 1 ORDER BY score DESC LIMIT 5
-    """).fetchall()
-
-    # 4. Popular Products
-    popular_products = conn.execute("""
-        SELECT p.name, p.id, b.name as brand_name, AVG(pm.sentiment_score) as score, count(pm.id) as c
-        FROM products p
-        JOIN product_mentions pm ON p.id = pm.product_id
-        LEFT JOIN brands b ON p.brand_id = b.id
-        GROUP BY p.id HAVING c > 1 ORDER BY score DESC LIMIT 5
-    """).fetchall()
+    # Trending / popular rankings come from the materialized trending_cache
+    trending = get_trending(conn)
 
     channels = conn.execute("SELECT channel_id, title, subscriber_count, platform FROM channels ORDER BY subscriber_count DESC LIMIT 10").fetchall()
 
     return render_template(
         "brands_landing.html",
-        trending_brands=trending_brands,
-        trending_products=trending_products,
-        popular_brands=popular_brands,
-        popular_products=popular_products,
-        channels=channels
+        channels=channels,
+        **trending
     )
 
+# Topic / brand / product word clouds for channel_profile, each returned as
+# a ready-to-embed JSON array of {text, weight}. Names are free text, so
+# <, > and & are escaped the way Jinja's tojson would for a <script> block.
+_SQL_CLOUD_JSON = r"""replace(replace(replace(
+        (SELECT json_group_array(json_object('text', text, 'weight', cnt)) FROM {cte}),
+        '<', '\u003c'), '>', '\u003e'), '&', '\u0026')"""
+_SQL_CHANNEL_CLOUDS = """
+    WITH
+    t AS (SELECT t.topic AS text, COUNT(*) AS cnt
+          FROM videos v JOIN video_topics t ON t.video_id = v.video_id
+          WHERE v.channel_id = ?1
+          GROUP BY t.topic ORDER BY cnt DESC, t.topic LIMIT 40),
+    b AS (SELECT b.name AS text, COUNT(*) AS cnt
+          FROM brand_mentions bm JOIN brands b ON bm.brand_id = b.id
+          WHERE bm.channel_id = ?1 GROUP BY bm.brand_id ORDER BY cnt DESC LIMIT 30),
+    p AS (SELECT p.name AS text, COUNT(*) AS cnt
+          FROM product_mentions pm JOIN products p ON pm.product_id = p.id
+          WHERE pm.channel_id = ?1 GROUP BY pm.product_id ORDER BY cnt DESC LIMIT 30)
+    SELECT {t}, {b}, {p}
+""".format(t=_SQL_CLOUD_JSON.format(cte="t"), b=_SQL_CLOUD_JSON.format(cte="b"), p=_SQL_CLOUD_JSON.format(cte="p"))
+
 @app.route("/channel/<channel_id>")
 def channel_profile(channel_id):
     conn = get_db()
-    channel = conn.execute("SELECT * FROM channels WHERE channel_id = ?", (channel_id,)).fetchone()
+    channel = conn.execute("SELECT channel_id, title, thumbnail_url, website, instagram, tiktok FROM channels WHERE channel_id = ?", (channel_id,)).fetchone()
     if not channel: return "Channel not found", 404
 
-    videos = conn.execute("SELECT * FROM videos WHERE channel_id = ? ORDER BY upload_date DESC", (channel_id,)).fetchall()
+    page = max(request.args.get("page", 1, type=int), 1)
+    videos = conn.execute("""
+        SELECT video_id, title, upload_date, thumbnail_url, view_count, overall_summary, overall_sentiment
+        FROM videos WHERE channel_id = ? ORDER BY upload_date DESC
+        LIMIT ? OFFSET ?
+    """, (channel_id, VIDEOS_PER_PAGE, (page - 1) * VIDEOS_PER_PAGE)).fetchall()
 
+    # Count and sentiment average come from one pass over the channel's videos.
+    # The score is derived from the label here, so it can't drift from it
+    # (100 positive / 50 neutral / 0 negative, unlabelled videos left out)
     stats_row = conn.execute("""
         SELECT
-            (SELECT COUNT(DISTINCT brand_id) FROM brand_mentions WHERE channel_id = ?) as brand_count,
-            (SELECT COUNT(DISTINCT product_id) FROM product_mentions WHERE channel_id = ?) as product_count
-    """, (channel_id, channel_id)).fetchone()
-
-    sents = [100 if "positive" in (v["overall_sentiment"] or "").lower() else 0 for v in videos]
-    avg_sentiment = sum(sents)/len(sents) if sents else 50
+            COUNT(*) as video_count,
+            AVG(CASE
+                WHEN overall_sentiment IS NULL OR overall_sentiment = '' THEN NULL
+                WHEN lower(overall_sentiment) LIKE '%positive%' THEN 100
+                WHEN lower(overall_sentiment) LIKE '%negative%' THEN 0
+                ELSE 50
+            END) as sentiment_avg,
+            (SELECT COUNT(DISTINCT brand_id) FROM brand_mentions WHERE channel_id = :cid) as brand_count,
+            (SELECT COUNT(DISTINCT product_id) FROM product_mentions WHERE channel_id = :cid) as product_count
+        FROM videos WHERE channel_id = :cid
+    """, {"cid": channel_id}).fetchone()
 
     stats = {
-        "video_count": len(videos),
-        "sentiment_avg": avg_sentiment,
+        "video_count": stats_row['video_count'],
+        "sentiment_avg": stats_row['sentiment_avg'] if stats_row['sentiment_avg'] is not None else 50,
         "brand_count": stats_row['brand_count'],
         "product_count": stats_row['product_count']
     }
-
-    # AI Channel Overview
-    channel_overview = get_channel_overview(conn, channel_id, channel['title'], videos)
-
-    top_brands = conn.execute("""
-        SELECT b.id, b.name, COUNT(*) as cnt
-        FROM brand_mentions bm JOIN brands b ON bm.brand_id = b.id
-        WHERE bm.channel_id = ? GROUP BY b.id ORDER BY cnt DESC LIMIT 30
-    """, (channel_id,)).fetchall()
-
-    top_products = conn.execute("""
-        SELECT p.id, p.name, b.name as brand_name, COUNT(*) as cnt
-        FROM product_mentions pm JOIN products p ON pm.product_id = p.id
-        LEFT JOIN brands b ON p.brand_id = b.id
-        WHERE pm.channel_id = ? GROUP BY p.id ORDER BY cnt DESC LIMIT 30
-    """, (channel_id,)).fetchall()
-
-    brand_cloud = [{"text": b['name'], "weight": b['cnt']} for b in top_brands]
-    product_cloud = [{"text": p['name'], "weight": p['cnt']} for p in top_products]
-
-    all_topics = []
-    for v in videos:
-        if v['topics']:
-            all_topics.extend([t.strip() for t in v['topics'].split(',') if t.strip()])
-    topic_cloud = [{"text": t, "weight": c} for t, c in Counter(all_topics).most_common(40)]
+    total_pages = max((stats["video_count"] + VIDEOS_PER_PAGE - 1) // VIDEOS_PER_PAGE, 1)
+
+    # AI Channel Overview: rendered from cache, otherwise generated in the
+    # background while the page polls /channel/<id>/overview
+    channel_overview = get_cached_channel_overview(conn, channel_id)
+    overview_pending = False
+    if channel_overview is None:
+        summaries = [r['overall_summary'] for r in conn.execute("""
+            SELECT overall_summary FROM videos
+            WHERE channel_id = ? AND overall_summary IS NOT NULL AND overall_summary != ''
+            ORDER BY upload_date DESC LIMIT ?
+        """, (channel_id, OVERVIEW_MIN_SUMMARIES))]
+        if len(summaries) >= OVERVIEW_MIN_SUMMARIES:
+            request_channel_overview(channel_id, channel['title'])
+            overview_pending = True
+        elif summaries:
+            channel_overview = build_channel_overview_stub(channel['title'], summaries)
+        else:
+            channel_overview = "No video data available to generate a summary."
+
+    topic_cloud, brand_cloud, product_cloud = conn.execute(_SQL_CHANNEL_CLOUDS, (channel_id,)).fetchone()
 
     return render_template(
         "channel_profile.html",
         channel=channel,
         videos=videos,
         stats=stats,
+        page=page,
+        total_pages=total_pages,
         channel_overview=channel_overview,
-        top_brands=top_brands[:6],
-        top_products=top_products[:6],
+        overview_pending=overview_pending,
         brand_cloud=brand_cloud,
         product_cloud=product_cloud,
         word_cloud_data=topic_cloud
     )
 
+@app.route("/channel/<channel_id>/overview")
+def channel_overview_status(channel_id):
+    conn = get_db()
+    overview = get_cached_channel_overview(conn, channel_id)
+    if overview is not None:
+        return jsonify({"status": "ready", "html": overview})
+    with _overview_lock:
+        pending = channel_id in _overview_in_flight
+    if pending:
+        return jsonify({"status": "pending"})
+    return jsonify({"status": "failed", "html": "<p>Unable to generate analysis at this time.</p>"})
+
+# Unfiltered directories page through the trigger-maintained stats tables
+# (add_entity_stats.py) by keyset: ?after=<mention_count>,<id> of the last
+# row shown, walking the (mention_count, id) index backwards (CROSS JOIN
+# pins the stats table as the outer loop so the planner keeps that order)
+DIRECTORY_PER_PAGE = 50
+_SQL_BRANDS_DIRECTORY = ("""
+    SELECT b.id, b.name, b.category, s.mention_count, s.product_count
+    FROM brand_stats s CROSS JOIN brands b ON b.id = s.brand_id
+    ORDER BY s.mention_count DESC, s.brand_id DESC LIMIT ?
+""", """
+    SELECT b.id, b.name, b.category, s.mention_count, s.product_count
+    FROM brand_stats s CROSS JOIN brands b ON b.id = s.brand_id
+    WHERE (s.mention_count, s.brand_id) < (?, ?)
+    ORDER BY s.mention_count DESC, s.brand_id DESC LIMIT ?
+""")
+_SQL_PRODUCTS_DIRECTORY = ("""
+    SELECT p.id, p.name, b.name as brand_name, s.mention_count
+    FROM product_stats s CROSS JOIN products p ON p.id = s.product_id LEFT JOIN brands b ON p.brand_id = b.id
+    ORDER BY s.mention_count DESC, s.product_id DESC LIMIT ?
+""", """
+    SELECT p.id, p.name, b.name as brand_name, s.mention_count
+    FROM product_stats s CROSS JOIN products p ON p.id = s.product_id LEFT JOIN brands b ON p.brand_id = b.id
+    WHERE (s.mention_count, s.product_id) < (?, ?)
+    ORDER BY s.mention_count DESC, s.product_id DESC LIMIT ?
+""")
+
+# ?channel= directories: one channel's mentions are few enough to aggregate
+# directly. Grouping on the mention-side id reads them in (channel_id, id)
+# index order, so the GROUP BY needs no temp b-tree. Kept apart from the
+# stats-table statements above: a single "(? IS NULL OR channel_id = ?)"
+# query could use neither index.
+_SQL_BRANDS_IN_CHANNEL = """
+    SELECT b.id, b.name, b.category, COUNT(*) as mention_count, s.product_count
+    FROM brand_mentions bm CROSS JOIN brands b ON b.id = bm.brand_id
+    LEFT JOIN brand_stats s ON s.brand_id = b.id
+    WHERE bm.channel_id = ?
+    GROUP BY bm.brand_id ORDER BY mention_count DESC
+"""
+_SQL_PRODUCTS_IN_CHANNEL = """
+    SELECT p.id, p.name, b.name as brand_name, COUNT(*) as mention_count
+    FROM product_mentions pm CROSS JOIN products p ON p.id = pm.product_id
+    LEFT JOIN brands b ON p.brand_id = b.id
+    WHERE pm.channel_id = ?
+    GROUP BY pm.product_id ORDER BY mention_count DESC
+"""
+
+def _directory_page(conn, sqls, after):
+    first_sql, next_sql = sqls
+    try:
+        count, last_id = (int(x) for x in after.split(","))
+    except (AttributeError, ValueError):
+        return conn.execute(first_sql, (DIRECTORY_PER_PAGE,)).fetchall()
+    return conn.execute(next_sql, (count, last_id, DIRECTORY_PER_PAGE)).fetchall()
+
+def _next_after(rows):
+    """Cursor for the following page, or None on the last one."""
+    if len(rows) < DIRECTORY_PER_PAGE:
+        return None
+    return f"{rows[-1]['mention_count']},{rows[-1]['id']}"
+
 @app.route("/brands/all")
+@cached_page
 def brands_directory():
     conn = get_db()
     filter_channel = request.args.get('channel')
-    sql = """
-        SELECT b.id, b.name, b.category, COUNT(DISTINCT bm.id) as mention_count, COUNT(DISTINCT p.id) as product_count
-        FROM brands b LEFT JOIN brand_mentions bm ON b.id = bm.brand_id LEFT JOIN products p ON b.id = p.brand_id
-    """
-    params = []
     if filter_channel:
-        sql = """
-            SELECT b.id, b.name, b.category, COUNT(bm.id) as mention_count, (SELECT COUNT(*) FROM products p WHERE p.brand_id = b.id) as product_count
-            FROM brands b JOIN brand_mentions bm ON b.id = bm.brand_id WHERE bm.channel_id = ?
-        """
-        params = [filter_channel]
+        brands = conn.execute(_SQL_BRANDS_IN_CHANNEL, (filter_channel,)).fetchall()
+        return render_template("brands_list.html", brands=brands, filter_channel=filter_channel)
 
-    sql += " GROUP BY b.id ORDER BY mention_count DESC"
-    return render_template("brands_list.html", brands=conn.execute(sql, params).fetchall(), filter_channel=filter_channel)
+    brands = _directory_page(conn, _SQL_BRANDS_DIRECTORY, request.args.get('after'))
+    return render_template("brands_list.html", brands=brands, filter_channel=None,
+                           after=request.args.get('after'), next_after=_next_after(brands))
 
 @app.route("/products/all")
+@cached_page
 def products_directory():
     conn = get_db()
     filter_channel = request.args.get('channel')
-    sql = """
-        SELECT p.id, p.name, b.name as brand_name, COUNT(pm.id) as mention_count
-        FROM products p LEFT JOIN product_mentions pm ON p.id = pm.product_id LEFT JOIN brands b ON p.brand_id = b.id
-    """
-    params = []
     if filter_channel:
-        sql = """
-            SELECT p.id, p.name, b.name as brand_name, COUNT(pm.id) as mention_count
-            FROM products p JOIN product_mentions pm ON p.id = pm.product_id LEFT JOIN brands b ON p.brand_id = b.id WHERE pm.channel_id = ?
-        """
-        params = [filter_channel]
-
-    sql += " GROUP BY p.id ORDER BY mention_count DESC"
-    return render_template("products_list.html", products=conn.execute(sql, params).fetchall(), filter_channel=filter_channel)
+        products = conn.execute(_SQL_PRODUCTS_IN_CHANNEL, (filter_channel,)).fetchall()
+        return render_template("products_list.html", products=products, filter_channel=filter_channel)
+
+    products = _directory_page(conn, _SQL_PRODUCTS_DIRECTORY, request.args.get('after'))
+    return render_template("products_list.html", products=products, filter_channel=None,
+                           after=request.args.get('after'), next_after=_next_after(products))
+
+# First 3 segments naming the brand/product in each video that mentions it,
+# joined into one snippet per video (replaces a query per video).
+# Segments are found through segments_fts (trigram, see add_fts_tables.py);
+# the LIKE form is the fallback for names under 3 chars or a DB without it.
+_SQL_SNIPPETS = """
+    WITH ranked AS (
+        SELECT s.video_id, s.text,
+               ROW_NUMBER() OVER (PARTITION BY s.video_id ORDER BY s.start_time) AS rn
+        FROM video_segments s
+        WHERE s.video_id IN (SELECT video_id FROM {mentions} WHERE {id_col} = ?)
+          AND {match}
+    )
+    SELECT video_id, GROUP_CONCAT(text, ' ... ') AS snippet
+    FROM (SELECT video_id, text FROM ranked WHERE rn <= 3 ORDER BY video_id, rn)
+    GROUP BY video_id
+"""
+_SNIPPET_MATCH = (
+    "s.id IN (SELECT rowid FROM segments_fts WHERE segments_fts MATCH ?)",
+    "s.text LIKE ?",   # already case-insensitive for ASCII, no lower() per segment
+)
+_SQL_BRAND_SNIPPETS = tuple(_SQL_SNIPPETS.format(mentions="brand_mentions", id_col="brand_id", match=m) for m in _SNIPPET_MATCH)
+_SQL_PRODUCT_SNIPPETS = tuple(_SQL_SNIPPETS.format(mentions="product_mentions", id_col="product_id", match=m) for m in _SNIPPET_MATCH)
+
+# Daily mention count / average sentiment for the profile charts, returned
+# as three ready-to-embed JSON arrays (labels, mentions, sentiment)
+_SQL_TIMELINE = """
+    SELECT json_group_array(day), json_group_array(cnt), json_group_array(score)
+    FROM (
+        SELECT date(first_seen_date) AS day, COUNT(*) AS cnt, AVG(sentiment_score) AS score
+        FROM {mentions} WHERE {id_col} = ? GROUP BY day ORDER BY day ASC
+    )
+"""
+_SQL_BRAND_TIMELINE = _SQL_TIMELINE.format(mentions="brand_mentions", id_col="brand_id")
+_SQL_PRODUCT_TIMELINE = _SQL_TIMELINE.format(mentions="product_mentions", id_col="product_id")
+
+# Channel with the most mentions: counted off the covering
+# (entity_id, first_seen_date, sentiment_score, channel_id) index, then
+# one videos lookup for its name (not a videos join per mention)
+_SQL_TOP_CREATOR = """
+    SELECT v.channel_name, m.cnt
+    FROM (SELECT channel_id, COUNT(*) AS cnt FROM {mentions} WHERE {id_col} = ?
+          GROUP BY channel_id ORDER BY cnt DESC LIMIT 1) m
+    JOIN videos v ON v.channel_id = m.channel_id
+    LIMIT 1
+"""
+_SQL_BRAND_TOP_CREATOR = _SQL_TOP_CREATOR.format(mentions="brand_mentions", id_col="brand_id")
+_SQL_PRODUCT_TOP_CREATOR = _SQL_TOP_CREATOR.format(mentions="product_mentions", id_col="product_id")
+
+def _mention_snippets(conn, sqls, entity_id, name):
+    """{video_id: snippet} for the videos where `name` appears in the transcript."""
+    # Plain (video_id, snippet) tuples go straight into dict(), no per-row Python
+    cur = conn.cursor()
+    cur.row_factory = None
+    fts_sql, like_sql = sqls
+    match = fts_query(name)
+    if match:
+        try:
+            return dict(cur.execute(fts_sql, (entity_id, match)))
+        except sqlite3.OperationalError:
+            pass
+    return dict(cur.execute(like_sql, (entity_id, f"%{name}%")))
+
+# Mention videos for brand_profile, with and without the ?channel= filter
+_SQL_BRAND_VIDEOS_TEMPLATE = """
+    SELECT v.video_id, v.title, v.channel_name, v.upload_date, v.thumbnail_url, bm.mention_count, bm.sentiment_score, v.overall_summary
+    FROM brand_mentions bm JOIN videos v ON bm.video_id = v.video_id
+    WHERE bm.brand_id = ?{channel_filter}
+    ORDER BY v.upload_date DESC
+"""
+_SQL_BRAND_VIDEOS = _SQL_BRAND_VIDEOS_TEMPLATE.format(channel_filter="")
+_SQL_BRAND_VIDEOS_IN_CHANNEL = _SQL_BRAND_VIDEOS_TEMPLATE.format(channel_filter=" AND bm.channel_id = ?")
 
 @app.route("/brand/<brand_id>")
+@cached_page
 def brand_profile(brand_id):
     conn = get_db()
     filter_channel = request.args.get('channel')
 
-    brand = conn.execute("SELECT * FROM brands WHERE id = ?", (brand_id,)).fetchone()
+    brand = conn.execute("SELECT name, category FROM brands WHERE id = ?", (brand_id,)).fetchone()
     if not brand: return "Brand not found", 404
 
     metrics = conn.execute("SELECT COUNT(*) as total_mentions, COUNT(DISTINCT channel_id) as unique_channels, AVG(sentiment_score) as avg_sentiment, MAX(first_seen_date) as last_mentioned FROM brand_mentions WHERE brand_id = ?", (brand_id,)).fetchone()
 
-    top_creator = conn.execute("SELECT channel_name, COUNT(*) as cnt FROM brand_mentions bm JOIN videos v ON bm.video_id = v.video_id WHERE bm.brand_id = ? GROUP BY v.channel_id ORDER BY cnt DESC LIMIT 1", (brand_id,)).fetchone()
+    top_creator = conn.execute(_SQL_BRAND_TOP_CREATOR, (brand_id,)).fetchone()
 
     top_products = conn.execute("SELECT p.id, p.name, COUNT(pm.id) as cnt, COALESCE(AVG(pm.sentiment_score), 0) as score FROM products p LEFT JOIN product_mentions pm ON p.id = pm.product_id WHERE p.brand_id = ? GROUP BY p.id ORDER BY cnt DESC", (brand_id,)).fetchall()
 
-    sql = "SELECT v.video_id, v.title, v.channel_name, v.upload_date, v.thumbnail_url, bm.mention_count, bm.sentiment_score, v.overall_summary FROM brand_mentions bm JOIN videos v ON bm.video_id = v.video_id WHERE bm.brand_id = ?"
-    params = [brand_id]
     if filter_channel:
-        sql += " AND bm.channel_id = ?"
-        params.append(filter_channel)
-    sql += " ORDER BY v.upload_date DESC"
-
-    videos_rows = conn.execute(sql, params).fetchall()
+        videos = fetch_dicts(conn, _SQL_BRAND_VIDEOS_IN_CHANNEL, (brand_id, filter_channel))
+    else:
+        videos = fetch_dicts(conn, _SQL_BRAND_VIDEOS, (brand_id,))
+    snippets = _mention_snippets(conn, _SQL_BRAND_SNIPPETS, brand_id, brand['name'])
 
-    videos = []
     llm_input = []
-    for row in videos_rows:
-        vid = dict(row)
-        matches = conn.execute("SELECT text FROM video_segments WHERE video_id = ? AND lower(text) LIKE ? LIMIT 3", (vid['video_id'], f"%{brand['name'].lower()}%")).fetchall()
-        snippet = " ... ".join([m['text'] for m in matches]) if matches else "Brand mentioned in video."
+    for vid in videos:
+        snippet = snippets.get(vid['video_id'], "Brand mentioned in video.")
         vid['raw_snippet'] = snippet
         vid['display_summary'] = vid.get('overall_summary') or snippet
         llm_input.append({"video_id": vid['video_id'], "date": vid['upload_date'], "text": snippet})
-        videos.append(vid)
 
     intelligence = get_brand_intelligence(conn, brand_id, brand['name'], llm_input, metrics['last_mentioned'])
 
-    timeline = conn.execute("SELECT date(first_seen_date) as day, COUNT(*) as cnt, AVG(sentiment_score) as score FROM brand_mentions WHERE brand_id = ? GROUP BY day ORDER BY day ASC", (brand_id,)).fetchall()
+    chart_labels, chart_mentions, chart_sentiment = conn.execute(_SQL_BRAND_TIMELINE, (brand_id,)).fetchone()
 
-    return render_template("brand_profile.html", brand=brand, metrics=metrics, top_creator=top_creator, top_products=top_products, videos=videos, marketing_brief=intelligence.get('brief'), marketing_brief_data=intelligence, chart_labels=[r['day'] for r in timeline], chart_mentions=[r['cnt'] for r in timeline], chart_sentiment=[r['score'] for r in timeline], filter_channel_id=filter_channel)
+    return render_template("brand_profile.html", brand=brand, metrics=metrics, top_creator=top_creator, top_products=top_products, videos=videos, marketing_brief=intelligence.get('brief'), marketing_brief_data=intelligence, chart_labels=chart_labels, chart_mentions=chart_mentions, chart_sentiment=chart_sentiment, filter_channel_id=filter_channel)
 
 @app.route("/product/<int:product_id>")
+@cached_page
 def product_profile(product_id):
     conn = get_db()
     product = conn.execute("SELECT p.id, p.name, b.id AS brand_id, b.name AS brand_name FROM products p LEFT JOIN brands b ON p.brand_id = b.id WHERE p.id = ?", (product_id,)).fetchone()
     if not product: return "Product not found", 404
 
     metrics = conn.execute("SELECT COUNT(*) as total_mentions, COUNT(DISTINCT channel_id) as unique_channels, AVG(sentiment_score) as avg_sentiment, MAX(first_seen_date) as last_mentioned FROM product_mentions WHERE product_id = ?", (product_id,)).fetchone()
-    top_creator = conn.execute("SELECT channel_name, COUNT(*) as cnt FROM product_mentions pm JOIN videos v ON pm.video_id = v.video_id WHERE pm.product_id = ? GROUP BY v.channel_id ORDER BY cnt DESC LIMIT 1", (product_id,)).fetchone()
+    top_creator = conn.execute(_SQL_PRODUCT_TOP_CREATOR, (product_id,)).fetchone()
 
-    videos_rows = conn.execute("SELECT v.video_id, v.title, v.channel_name, v.upload_date, v.thumbnail_url, pm.mention_count, pm.sentiment_score, v.overall_summary FROM product_mentions pm JOIN videos v ON pm.video_id = v.video_id WHERE pm.product_id = ? ORDER BY v.upload_date DESC", (product_id,)).fetchall()
+    videos = fetch_dicts(conn, "SELECT v.video_id, v.title, v.channel_name, v.upload_date, v.thumbnail_url, pm.mention_count, pm.sentiment_score, v.overall_summary FROM product_mentions pm JOIN videos v ON pm.video_id = v.video_id WHERE pm.product_id = ? ORDER BY v.upload_date DESC", (product_id,))
 
-    videos = []
+    snippets = _mention_snippets(conn, _SQL_PRODUCT_SNIPPETS, product_id, product['name'])
+
+    # Single pass; lookups bound to locals since this runs once per mention
     llm_input = []
-    for row in videos_rows:
-        vid = dict(row)
-        matches = conn.execute("SELECT text FROM video_segments WHERE video_id = ? AND lower(text) LIKE ? LIMIT 3", (vid['video_id'], f"%{product['name'].lower()}%")).fetchall()
-        snippet = " ... ".join([m['text'] for m in matches]) if matches else "Mentioned in video."
+    add_input, get_snippet = llm_input.append, snippets.get
+    for vid in videos:
+        snippet = get_snippet(vid['video_id'], "Mentioned in video.")
         vid['raw_snippet'] = snippet
-        vid['display_summary'] = vid.get('overall_summary') or snippet
-        llm_input.append({"video_id": vid['video_id'], "date": vid['upload_date'], "text": snippet})
-        videos.append(vid)
+        vid['display_summary'] = vid['overall_summary'] or snippet
+        add_input({"video_id": vid['video_id'], "date": vid['upload_date'], "text": snippet})
 
     intelligence = get_product_intelligence(conn, product_id, product['name'], llm_input, metrics['last_mentioned'])
-    timeline = conn.execute("SELECT date(first_seen_date) as day, COUNT(*) as cnt, AVG(sentiment_score) as score FROM product_mentions WHERE product_id = ? GROUP BY day ORDER BY day ASC", (product_id,)).fetchall()
+    chart_labels, chart_mentions, chart_sentiment = conn.execute(_SQL_PRODUCT_TIMELINE, (product_id,)).fetchone()
 
-    return render_template("product_profile.html", product=product, metrics=metrics, top_creator=top_creator, videos=videos, marketing_brief_data=intelligence, chart_labels=[r['day'] for r in timeline], chart_mentions=[r['cnt'] for r in timeline], chart_sentiment=[r['score'] for r in timeline])
+    return render_template("product_profile.html", product=product, metrics=metrics, top_creator=top_creator, videos=videos, marketing_brief_data=intelligence, chart_labels=chart_labels, chart_mentions=chart_mentions, chart_sentiment=chart_sentiment)
 
 @app.route("/video/<video_id>")
+@cached_page
 def video_profile(video_id):
     conn = get_db()
-    video = conn.execute("SELECT * FROM videos WHERE video_id = ?", (video_id,)).fetchone()
+    video = conn.execute("SELECT video_id, title, channel_id, channel_name, upload_date, overall_summary, overall_sentiment, topics FROM videos WHERE video_id = ?", (video_id,)).fetchone()
     if not video: return "Video not found", 404
-    segments = conn.execute("SELECT * FROM video_segments WHERE video_id = ? ORDER BY start_time ASC", (video_id,)).fetchall()
+    segments = conn.execute("SELECT start_time, text FROM video_segments WHERE video_id = ? ORDER BY start_time ASC", (video_id,)).fetchall()
     brands = conn.execute("SELECT DISTINCT b.id, b.name FROM brand_mentions bm JOIN brands b ON bm.brand_id = b.id WHERE bm.video_id = ?", (video_id,)).fetchall()
     products = conn.execute("SELECT DISTINCT p.id, p.name FROM product_mentions pm JOIN products p ON pm.product_id = p.id WHERE pm.video_id = ?", (video_id,)).fetchall()
     return render_template("video_profile.html", video=video, segments=segments, brands=brands, products=products)
 
+# One round-trip for all entity types: SQLite builds the response JSON
+# itself (no Row objects, no jsonify pass) and reports the hit count
+_SQL_AUTOCOMPLETE_TEMPLATE = """
+    WITH
+    c AS (SELECT json_group_array(json_object('id', channel_id, 'name', title, 'platform', 'YouTube')) AS j
+          FROM ({channels} LIMIT 5)),
+    b AS (SELECT json_group_array(json_object('id', id, 'name', name)) AS j
+          FROM ({brands} LIMIT 5)),
+    p AS (SELECT json_group_array(json_object('id', id, 'name', name)) AS j
+          FROM ({products} LIMIT 5))
+    SELECT json_object('brands', json(b.j), 'channels', json(c.j), 'products', json(p.j), 'semantic', json('[]')),
+           json_array_length(c.j) + json_array_length(b.j) + json_array_length(p.j)
+    FROM c, b, p
+"""
+_SQL_AUTOCOMPLETE = (
+    _SQL_AUTOCOMPLETE_TEMPLATE.format(
+        channels="SELECT c.channel_id, c.title FROM channels_fts f JOIN channels c ON c.rowid = f.rowid WHERE channels_fts MATCH ?1",
+        brands="SELECT b.id, b.name FROM brands_fts f JOIN brands b ON b.id = f.rowid WHERE brands_fts MATCH ?1",
+        products="SELECT p.id, p.name FROM products_fts f JOIN products p ON p.id = f.rowid WHERE products_fts MATCH ?1",
+    ),
+    # Prefix LIKE (case-insensitive) is served by the NOCASE name indexes
+    _SQL_AUTOCOMPLETE_TEMPLATE.format(
+        channels="SELECT channel_id, title FROM channels WHERE title LIKE ?1",
+        brands="SELECT id, name FROM brands WHERE name LIKE ?1",
+        products="SELECT id, name FROM products WHERE name LIKE ?1",
+    ),
+)
+
+# Keystrokes repeat prefixes constantly: DB results are reused for up to
+# AUTOCOMPLETE_TTL seconds (the time bucket is part of the cache key), and
+# browsers may reuse the response for as long
+AUTOCOMPLETE_TTL = 30
+
+@lru_cache(maxsize=2048)
+def _autocomplete_db(query, bucket):
+    with pooled_conn() as conn:
+        return _fts_or_like(conn, _SQL_AUTOCOMPLETE, query, prefix=True)[0]
+
 @app.route("/autocomplete")
 def autocomplete():
     query = request.args.get("q", "").strip().lower()
-    conn = get_db()
-    results = {"channels": [], "brands": [], "products": [], "semantic": []}
-    if not query: return jsonify(results)
+    if not query: return jsonify({"channels": [], "brands": [], "products": [], "semantic": []})
 
-    def get_matches(t, cid, cname, lim=5): return conn.execute(f"SELECT {cid}, {cname} FROM {t} WHERE lower({cname}) LIKE ? LIMIT ?", (f"%{query}%", lim)).fetchall()
-    for r in get_matches("channels", "channel_id", "title"): results["channels"].append({"id": r[0], "name": r[1], "platform": "YouTube"})
-    for r in get_matches("brands", "id", "name"): results["brands"].append({"id": r[0], "name": r[1]})
-    for r in get_matches("products", "id", "name"): results["products"].append({"id": r[0], "name": r[1]})
+    body, hits = _autocomplete_db(query, int(time.monotonic() // AUTOCOMPLETE_TTL))
 
-    if sum(len(v) for v in results.values()) < 3:
+    resp = Response(body, mimetype="application/json")
+    # Superseded keystrokes keep their DB hits but skip the LLM call; terms
+    # too short for it skip the debounce wait as well. The debounce key is a
+    # per-tab token from the page's JS (an IP is shared behind NAT / proxies);
+    # clients without one aren't debounced
+    client_key = request.headers.get("X-Autocomplete-Session", "")[:64] or None
+    if hits < 3 and len(query) >= LLM_MIN_TERM and (client_key is None or settle(client_key)):
         semantic = llm_semantic_suggestions(query)
-        results["semantic"] = [{"id": None, "name": s} for s in semantic]
-    return jsonify(results)
+        if semantic:
+            results = fastjson.loads(body)
+            results["semantic"] = [{"id": None, "name": s} for s in semantic]
+            resp = jsonify(results)
+    resp.headers["Cache-Control"] = f"public, max-age={AUTOCOMPLETE_TTL}"
+    return resp
 
 @app.route("/api/qa", methods=["POST"])
 def api_qa():
@@ -348,6 +572,8 @@ def api_qa():
     context_type = data.get("context_type")
     context_name = data.get("context_name")
     question = data.get("question")
+    if not isinstance(question, str) or not question.strip():
+        return jsonify({"error": "question is required"}), 400
     aggregates = data.get("aggregates", {})
     segments = data.get("segments", [])
     answer = ask_insights_llm(context_type, context_name, question, aggregates, segments)
@@ -362,28 +588,91 @@ def admin_dashboard():
         "transcripts": conn.execute("SELECT count(DISTINCT video_id) FROM video_segments").fetchone()[0],
         "failed": conn.execute("SELECT count(*) FROM ingestion_logs WHERE status='FAILED'").fetchone()[0]
     }
-    logs = conn.execute("SELECT * FROM ingestion_logs ORDER BY timestamp DESC LIMIT 50").fetchall()
+    logs = conn.execute("SELECT timestamp, video_id, status, error_message FROM ingestion_logs ORDER BY timestamp DESC LIMIT 50").fetchall()
     channels = conn.execute("SELECT title, video_count, platform FROM channels ORDER BY video_count DESC").fetchall()
     return render_template("admin_dashboard.html", counts=counts, logs=logs, channels=channels)
 
+# (FTS5 statement, LIKE fallback) pairs for the /search listings: videos...
+_SQL_SEARCH_VIDEOS = ("""
+    SELECT v.video_id, v.title, v.channel_name, v.thumbnail_url, v.upload_date, v.overall_summary
+    FROM videos_fts f JOIN videos v ON v.rowid = f.rowid
+    WHERE videos_fts MATCH ? ORDER BY v.upload_date DESC LIMIT 20
+""", """
+    SELECT video_id, title, channel_name, thumbnail_url, upload_date, overall_summary
+    FROM videos WHERE title LIKE ? ORDER BY upload_date DESC LIMIT 20
+""")
+
+# ...then channels, brands and products in one statement; rows come back as
+# (kind, id, name, thumbnail_url, subscriber_count) and are bucketed by kind
+_SQL_SEARCH_ENTITIES_TEMPLATE = """
+    SELECT * FROM (SELECT 'channels' AS kind, channel_id AS id, title AS name, thumbnail_url, subscriber_count
+                   FROM {channels} LIMIT 5)
+    UNION ALL
+    SELECT * FROM (SELECT 'brands', id, name, NULL, NULL FROM {brands} LIMIT 5)
+    UNION ALL
+    SELECT * FROM (SELECT 'products', id, name, NULL, NULL FROM {products} LIMIT 5)
+"""
+_SQL_SEARCH_ENTITIES = (
+    _SQL_SEARCH_ENTITIES_TEMPLATE.format(
+        channels="channels WHERE rowid IN (SELECT rowid FROM channels_fts WHERE channels_fts MATCH ?1)",
+        brands="brands WHERE id IN (SELECT rowid FROM brands_fts WHERE brands_fts MATCH ?1)",
+        products="products WHERE id IN (SELECT rowid FROM products_fts WHERE products_fts MATCH ?1)",
+    ),
+    _SQL_SEARCH_ENTITIES_TEMPLATE.format(
+        channels="channels WHERE title LIKE ?1",
+        brands="brands WHERE name LIKE ?1",
+        products="products WHERE name LIKE ?1",
+    ),
+)
+
+def _fts_or_like(conn, sqls, query, column=None, prefix=False):
+    """
+    Run the FTS5 statement of an (fts, like) pair, falling back to the
+    LIKE scan for terms too short for the trigram index or a DB without
+    the FTS tables (see add_fts_tables.py). `column` limits the MATCH to
+    one column; `prefix` makes the fallback a prefix match, which an
+    index can serve.
+    """
+    fts_sql, like_sql = sqls
+    match = fts_query(query)
+    if match:
+        try:
+            return conn.execute(fts_sql, (f"{column} : {match}" if column else match,)).fetchall()
+        except sqlite3.OperationalError:
+            pass
+    return conn.execute(like_sql, (f"{query}%" if prefix else f"%{query}%",)).fetchall()
+
 @app.route("/search")
 def search():
     query = request.args.get("q", "").strip()
     if not query: return redirect(url_for("home"))
     conn = get_db()
-    q_like = f"%{query}%"
-    sql = "SELECT video_id, title, channel_name, thumbnail_url, upload_date, overall_summary FROM videos WHERE title LIKE ? ORDER BY upload_date DESC LIMIT 20"
-    rows = conn.execute(sql, (q_like,)).fetchall()
-    videos = [dict(row) for row in rows]
-    return render_template("search.html", query=query, videos=videos,
-                           channels=conn.execute("SELECT * FROM channels WHERE title LIKE ? LIMIT 5", (q_like,)).fetchall(),
-                           brands=conn.execute("SELECT * FROM brands WHERE name LIKE ? LIMIT 5", (q_like,)).fetchall(),
-                           products=conn.execute("SELECT * FROM products WHERE name LIKE ? LIMIT 5", (q_like,)).fetchall(),
-                           ai_answer=answer_user_query(query))
+    videos = _fts_or_like(conn, _SQL_SEARCH_VIDEOS, query, column="title")
+    matches = {"channels": [], "brands": [], "products": []}
+    for row in _fts_or_like(conn, _SQL_SEARCH_ENTITIES, query):
+        matches[row["kind"]].append(row)
+    return render_template("search.html", query=query, videos=videos, ai_stream=True, **matches)
+
+@app.route("/search/stream")
+def search_stream():
+    """AI answer for /search as server-sent events, so the page doesn't wait on the LLM."""
+    query = request.args.get("q", "").strip()
+
+    def events():
+        for chunk in answer_user_query_stream(query, conn=get_db()):
+            yield b"data: " + fastjson.dumps(chunk) + b"\n\n"
+        yield b"event: done\ndata: \n\n"
+
+    return Response(stream_with_context(events()), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+# Built once; the context processor runs on every render
+_NAV = {"navbar_categories": ("Autos & Vehicles", "Beauty", "Comedy", "Education", "Entertainment", "Gaming", "Howto & Style", "Music", "News & Politics", "People & Blogs", "Pets & Animals", "Science & Technology", "Sports", "Travel & Events")}
 
 @app.context_processor
 def inject_categories():
-    return dict(navbar_categories=["Autos & Vehicles", "Beauty", "Comedy", "Education", "Entertainment", "Gaming", "Howto & Style", "Music", "News & Politics", "People & Blogs", "Pets & Animals", "Science & Technology", "Sports", "Travel & Events"])
+    return _NAV
 
 if __name__ == "__main__":
+    # run with FLASK_ENV=development to get template reloading back
     app.run(debug=True, host="0.0.0.0", port=5000)
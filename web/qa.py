@@ -1,16 +1,18 @@
 # web/qa.py
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed, wait
+from functools import lru_cache
 from typing import Any, Dict, List
 
 from config import OPENAI_API_KEY, OPENAI_MODEL, GEMINI_API_KEY, GEMINI_MODEL
 
-# OpenAI
+# OpenAI (the shared client is built on first use, see utils/llm_client)
 try:
-    from openai import OpenAI
-    _openai_client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+    from utils.llm_client import get_client
+    _openai_enabled = bool(OPENAI_API_KEY)
 except ImportError:
-    _openai_client = None
+    _openai_enabled = False
 
 # Gemini
 try:
@@ -24,6 +26,22 @@ except ImportError:
     _gemini_model = None
 
 
+# Gemini is a hedge, not a second vote: it is only started once OpenAI has
+# failed or taken longer than HEDGE_AFTER seconds, then the first usable
+# answer wins (the slower call finishes in the background and is cached)
+HEDGE_AFTER = 4.0
+ANSWER_TIMEOUT = 30.0
+_llm_executor = ThreadPoolExecutor(max_workers=8)
+
+
+# Input tokens drive answer latency and cost. Segments repeating an earlier
+# one's opening (sponsor reads, intros) are dropped, and the snippet block is
+# capped at roughly 2000 tokens (~4 chars each)
+SEGMENT_CHARS = 400
+SEGMENT_FINGERPRINT = 80
+SEGMENT_BLOCK_BUDGET = 8000
+
+
 def build_insights_prompt(
     context_type: str,
     context_name: str,
@@ -31,15 +49,22 @@ def build_insights_prompt(
     aggregates: Dict[str, Any],
     segments: List[Dict[str, Any]],
 ) -> str:
-    agg_json = json.dumps(aggregates, ensure_ascii=False, indent=2)
+    # Compact separators: indentation roughly doubles the tokens for no gain
+    agg_json = json.dumps(aggregates, ensure_ascii=False, separators=(",", ":"))
 
-    seg_snippets = []
+    lines, seen, used = [], set(), 0
     for s in segments[:30]:
-        seg_snippets.append(
-            f"- [{s.get('upload_date','')}] (video {s.get('video_id')}) "
-            f"{s.get('text','')[:400]}"
-        )
-    seg_block = "\n".join(seg_snippets)
+        text = " ".join((s.get('text') or '').split())[:SEGMENT_CHARS]
+        fingerprint = text[:SEGMENT_FINGERPRINT].lower()
+        if not text or fingerprint in seen:
+            continue
+        seen.add(fingerprint)
+        line = f"- [{s.get('upload_date','')}] (video {s.get('video_id')}) {text}"
+        used += len(line) + 1
+        if used > SEGMENT_BLOCK_BUDGET:
+            break
+        lines.append(line)
+    seg_block = "\n".join(lines)
 
     prompt = f"""
 You are a careful insights analyst for social video data.
@@ -69,15 +94,28 @@ Now answer the user's question:
     return prompt.strip()
 
 
+# The prompt is fully determined by (entity, question, data), so an identical
+# prompt gets the cached answer. Errors raise and are therefore never cached.
+@lru_cache(maxsize=512)
+def _openai_answer(prompt: str) -> str:
+    resp = get_client().responses.create(
+        model=OPENAI_MODEL,
+        input=prompt,
+    )
+    return (resp.output_text or "").strip()
+
+
+@lru_cache(maxsize=512)
+def _gemini_answer(prompt: str) -> str:
+    resp = _gemini_model.generate_content(prompt)
+    return (resp.text or "").strip()
+
+
 def call_openai(prompt: str) -> str | None:
-    if not _openai_client:
+    if not _openai_enabled:
         return None
     try:
-        resp = _openai_client.responses.create(
-            model=OPENAI_MODEL,
-            input=prompt,
-        )
-        return resp.output[0].content[0].text.strip()
+        return _openai_answer(prompt)
     except Exception as e:
         print(f"[QA] OpenAI error: {e}")
         return None
@@ -87,13 +125,31 @@ def call_gemini(prompt: str) -> str | None:
     if not _gemini_model:
         return None
     try:
-        resp = _gemini_model.generate_content(prompt)
-        return (resp.text or "").strip()
+        return _gemini_answer(prompt)
     except Exception as e:
         print(f"[QA] Gemini error: {e}")
         return None
 
 
+def _first_answer(prompt: str) -> str | None:
+    futures = []
+    if _openai_enabled:
+        futures.append(_llm_executor.submit(call_openai, prompt))
+        done, _ = wait(futures, timeout=HEDGE_AFTER)
+        if done and futures[0].result():
+            return futures[0].result()
+    if _gemini_model:
+        futures.append(_llm_executor.submit(call_gemini, prompt))
+    try:
+        for fut in as_completed(futures, timeout=ANSWER_TIMEOUT):
+            answer = fut.result()
+            if answer:
+                return answer
+    except TimeoutError:
+        print("[QA] No answer within the timeout")
+    return None
+
+
 def ask_insights_llm(
     context_type: str,
     context_name: str,
@@ -101,13 +157,10 @@ def ask_insights_llm(
     aggregates: Dict[str, Any],
     segments: List[Dict[str, Any]],
 ) -> str:
+    question = " ".join((question or "").split())
     prompt = build_insights_prompt(context_type, context_name, question, aggregates, segments)
 
-    answer = call_openai(prompt)
-    if answer:
-        return answer
-
-    answer = call_gemini(prompt)
+    answer = _first_answer(prompt)
     if answer:
         return answer
 